@@ -6,7 +6,7 @@ Aplicación multiplataforma (Windows/Linux) en PyQt6 para comparar dos coleccion
 de música y copiar carátulas y metadatos entre archivos.
 
 - Doble panel tipo Total Commander/Krusader
-- QTreeView con QFileSystemModel filtrando audio
+- QTreeView con modelo propio (os.scandir, carga perezosa) filtrando audio
 - Barra de ruta tipo Explorer (breadcrumb clicable) con soporte para discos Windows (C:, F:, etc)
 - Vista previa de carátula embebida
 - Vista de tags: Título, Artista, Álbum, Año, Pista, Género, Comentario, Álbum Artista, Compositor
@@ -22,31 +22,59 @@ Licencia: GPL3
 from __future__ import annotations
 
 import base64
+import functools
+import hashlib
+import json
 import os
+import re
+import shutil
+import sqlite3
+import stat
 import sys
+import tempfile
+import threading
+import time
 import traceback
 import ctypes
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from pathlib import Path, PurePosixPath, PureWindowsPath
+from pathlib import PurePosixPath, PureWindowsPath
 from typing import Dict, Optional, Tuple
 
 from PyQt6.QtCore import (
     Qt,
+    QAbstractItemModel,
+    QDateTime,
     QDir,
+    QFileSystemWatcher,
     QSettings,
     QSize,
+    QStandardPaths,
     QTimer,
+    QBuffer,
+    QByteArray,
+    QIODevice,
+    QLocale,
+    QMetaObject,
     QModelIndex,
+    QObject,
+    QPoint,
+    QRunnable,
+    QThread,
+    QThreadPool,
     pyqtSignal,
+    pyqtSlot,
 )
 from PyQt6.QtGui import (
     QAction,
     QIcon,
+    QImage,
+    QImageIOHandler,
+    QImageReader,
     QPixmap,
     QPalette,
     QColor,
-    QFileSystemModel,
 )
 from PyQt6.QtWidgets import (
     QApplication,
@@ -66,25 +94,78 @@ from PyQt6.QtWidgets import (
     QFormLayout,
     QScrollArea,
     QMenu,
+    QFileIconProvider,
 )
 
 # ---------- Backend: lectura/escritura de tags y carátulas (mutagen) ----------
 # Nota: mutagen es muy práctico para manejar múltiples formatos.
+# Solo se importa aquí lo de MP3 (el caso más común); FLAC, OGG y MP4 se importan
+# dentro de cada rama, la primera vez que se usan, para no alargar el arranque.
 try:
     from mutagen import File as MFile
-    from mutagen.id3 import ID3, APIC, ID3NoHeaderError
-    from mutagen.flac import FLAC, Picture
-    from mutagen.oggvorbis import OggVorbis
-    from mutagen.mp4 import MP4, MP4Cover
-    from mutagen.easyid3 import EasyID3
+    from mutagen.id3 import ID3, APIC, COMM, Frames, ID3NoHeaderError
 except Exception as e:
     MFile = None
     _MUTAGEN_IMPORT_ERROR = e
 else:
     _MUTAGEN_IMPORT_ERROR = None
 
+# Lector rápido opcional (solo lectura). Si no está instalado se usa mutagen.
+try:
+    from tinytag import TinyTag
+except Exception:
+    TinyTag = None
+
+
+# Extensión -> tipo de archivo (clave de despacho de lectura/escritura)
+AUDIO_KINDS = {".mp3": "mp3", ".flac": "flac", ".ogg": "ogg", ".m4a": "m4a"}
+AUDIO_EXTS = frozenset(AUDIO_KINDS)
+
+# Tamaño del buffer de lectura al abrir archivos de audio para mutagen
+READ_BUFFER_SIZE = 64 * 1024
 
-AUDIO_EXTS = {".mp3", ".flac", ".ogg", ".m4a"}
+# Frames ID3 conocidos menos APIC: para leer tags sin decodificar imágenes
+_ID3_FRAMES_NO_PICTURE = (
+    {k: v for k, v in Frames.items() if k != "APIC"} if _MUTAGEN_IMPORT_ERROR is None else None
+)
+
+# Campos canónicos -> frames ID3 de texto (el comentario va aparte en COMM)
+ID3_TEXT_FRAMES = {
+    "title": "TIT2",
+    "artist": "TPE1",
+    "album": "TALB",
+    "year": "TDRC",
+    "track": "TRCK",
+    "genre": "TCON",
+    "albumartist": "TPE2",
+    "composer": "TCOM",
+}
+
+# Campos canónicos -> claves VorbisComment (FLAC y OGG)
+VORBIS_FIELDS = {
+    "title": "TITLE",
+    "artist": "ARTIST",
+    "album": "ALBUM",
+    "year": "DATE",
+    "track": "TRACKNUMBER",
+    "genre": "GENRE",
+    "comment": "COMMENT",
+    "albumartist": "ALBUMARTIST",
+    "composer": "COMPOSER",
+}
+_VORBIS_KEYS_LOWER = frozenset(k.lower() for k in VORBIS_FIELDS.values())
+
+# Campos canónicos -> átomos de texto MP4 (la pista va aparte en "trkn")
+MP4_TEXT_FIELDS = {
+    "title": "\xa9nam",
+    "artist": "\xa9ART",
+    "album": "\xa9alb",
+    "year": "\xa9day",
+    "genre": "\xa9gen",
+    "comment": "\xa9cmt",
+    "albumartist": "aART",
+    "composer": "\xa9wrt",
+}
 
 CANON_FIELDS = [
     ("title", "Título"),
@@ -127,11 +208,12 @@ def list_linux_mount_points() -> list[str]:
         if os.path.isdir(c):
             out.append(c)
             # añadir subdirectorios (montajes típicos)
+            # scandir reutiliza el tipo de cada entrada (d_type): sin un stat por hijo
             try:
-                for name in sorted(os.listdir(c)):
-                    full = os.path.join(c, name)
-                    if os.path.isdir(full):
-                        out.append(full)
+                with os.scandir(c) as it:
+                    for e in sorted(it, key=lambda e: e.name):
+                        if e.is_dir():
+                            out.append(e.path)
             except Exception:
                 pass
     # quitar duplicados manteniendo orden
@@ -144,31 +226,93 @@ def list_linux_mount_points() -> list[str]:
     return uniq
 
 
+_ROOTS_TTL = 5.0  # segundos
+_roots_cache: Tuple[float, list] = (0.0, [])
+
+
 def list_roots_for_platform() -> list[str]:
+    # El menú de unidades se reconstruye en cada apertura: reusar la lista unos segundos
+    global _roots_cache
+    now = time.monotonic()
+    stamp, roots = _roots_cache
+    if roots and now - stamp < _ROOTS_TTL:
+        return list(roots)
     if os.name == "nt":
-        return list_windows_drives()
-    return list_linux_mount_points()
+        roots = list_windows_drives()
+    else:
+        roots = list_linux_mount_points()
+    _roots_cache = (now, roots)
+    return list(roots)
 
 
-def is_audio_file(path: str) -> bool:
-    try:
-        return Path(path).suffix.lower() in AUDIO_EXTS and Path(path).is_file()
-    except Exception:
-        return False
+def has_audio_ext(path: str) -> bool:
+    # Solo mira la extensión (sin mayúsculas/minúsculas), sin tocar el disco
+    return os.path.splitext(path)[1].lower() in AUDIO_EXTS
 
 
-def guess_mime_from_bytes(data: bytes) -> str:
-    # Muy simple: reconocer JPEG/PNG por firma.
+def sniff_image_mime(data: bytes) -> Optional[str]:
+    # Reconocer JPEG/PNG por firma (magic bytes). None si no se reconoce.
     if data.startswith(b"\xFF\xD8\xFF"):
         return "image/jpeg"
     if data.startswith(b"\x89PNG\r\n\x1a\n"):
         return "image/png"
-    return "image/jpeg"
+    return None
+
+
+def guess_mime_from_bytes(data: bytes) -> str:
+    return sniff_image_mime(data) or "image/jpeg"
+
+
+def decode_cover_image(data: bytes, max_side: int) -> QImage:
+    """
+    Decodifica la carátula ajustada a un cuadro de max_side x max_side.
+    Con QImageReader.setScaledSize el decoder (p.ej. JPEG) reduce mientras
+    decodifica, sin crear primero la imagen a resolución completa.
+    Devuelve una QImage nula si los datos no son una imagen válida.
+    """
+    # Única copia de los bytes hacia Qt (PyQt6 no expone QByteArray.fromRawData)
+    buf = QBuffer()
+    buf.setData(QByteArray(data))
+    buf.open(QIODevice.OpenModeFlag.ReadOnly)
+    reader = QImageReader(buf)
+    reader.setAutoTransform(True)  # respetar orientación EXIF
+    size = reader.size()
+    # Solo si el decoder reduce por sí mismo (JPEG); si no (PNG), QImageReader
+    # haría un único escalado suave desde la resolución completa
+    if (size.isValid() and (size.width() > max_side or size.height() > max_side)
+            and reader.supportsOption(QImageIOHandler.ImageOption.ScaledSize)):
+        reader.setScaledSize(size.scaled(max_side, max_side, Qt.AspectRatioMode.KeepAspectRatio))
+    img = reader.read()
+    if img.isNull():
+        return img
+    if max(img.width(), img.height()) != max_side:
+        # Imagen sin reducir en el decoder, más pequeña que el cuadro o con redondeo
+        img = scale_image_to_box(img, max_side)
+    return img
+
+
+def scale_image_to_box(img: QImage, side: int) -> QImage:
+    """
+    Escala img para que quepa en side x side. Si es mucho más grande (>4x),
+    primero se reduce rápido (sin filtrar) a 2x y luego se suaviza a 1x:
+    el filtro suave solo recorre (2*side)² píxeles, con calidad casi igual.
+    """
+    if img.width() > 4 * side or img.height() > 4 * side:
+        img = img.scaled(
+            QSize(2 * side, 2 * side),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.FastTransformation,
+        )
+    return img.scaled(
+        QSize(side, side),
+        Qt.AspectRatioMode.KeepAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    )
 
 
 def get_audio_kind(path: str) -> str:
-    ext = Path(path).suffix.lower()
-    return ext.lstrip(".")
+    # Una sola búsqueda en AUDIO_KINDS; "" si no es un formato soportado
+    return AUDIO_KINDS.get(os.path.splitext(path)[1].lower(), "")
 
 
 def safe_str(x) -> str:
@@ -181,6 +325,14 @@ def safe_str(x) -> str:
     return str(x)
 
 
+def safe_stat(path: str) -> Optional[os.stat_result]:
+    # Un solo stat() que sirve de comprobación de existencia y tipo; None si falla
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+
 def _mutagen_load(path: str):
     if _MUTAGEN_IMPORT_ERROR is not None:
         raise RuntimeError(f"mutagen no está disponible: {_MUTAGEN_IMPORT_ERROR}")
@@ -190,27 +342,63 @@ def _mutagen_load(path: str):
     return audio
 
 
-def get_cover_bytes(path: str) -> Optional[Tuple[bytes, str]]:
+def load_tags_object(path: str, want_cover: bool = True, kind: Optional[str] = None):
+    """
+    Abre el archivo una sola vez y devuelve el objeto mutagen con los tags:
+    ID3 (mp3), FLAC, OggVorbis o MP4. Se puede pasar a get_tags/get_cover_bytes
+    para no volver a parsear el archivo.
+
+    want_cover=False: en MP3 los frames APIC no se decodifican (quedan como
+    frames desconocidos), que es lo más caro del bloque ID3.
+    """
+    if _MUTAGEN_IMPORT_ERROR is not None:
+        raise RuntimeError(f"mutagen no está disponible: {_MUTAGEN_IMPORT_ERROR}")
+    if kind is None:
+        kind = get_audio_kind(path)
+    if kind not in AUDIO_KINDS.values():
+        return None
+
+    # Buffer explícito: mutagen lee en trozos pequeños con muchos seek, y el
+    # buffer por defecto (st_blksize) puede ser diminuto en NFS/SMB.
+    # El objeto guarda la ruta (f.name), así que save() sigue funcionando.
+    with open(path, "rb", buffering=READ_BUFFER_SIZE) as f:
+        if kind == "mp3":
+            try:
+                return ID3(f, known_frames=None if want_cover else _ID3_FRAMES_NO_PICTURE)
+            except ID3NoHeaderError:
+                return ID3()
+        if kind == "flac":
+            from mutagen.flac import FLAC
+            return FLAC(f)
+        if kind == "ogg":
+            from mutagen.oggvorbis import OggVorbis
+            return OggVorbis(f)
+        from mutagen.mp4 import MP4
+        return MP4(f)
+
+
+def get_cover_bytes(path: str, audio=None, kind: Optional[str] = None) -> Optional[Tuple[bytes, str]]:
     """
     Devuelve (bytes, mime) de la carátula embebida, o None si no hay.
     Soporta MP3, FLAC, OGG Vorbis (METADATA_BLOCK_PICTURE), M4A/MP4.
+    audio/kind: objeto ya abierto con load_tags_object() y su tipo (opcionales).
     """
-    kind = get_audio_kind(path)
+    if kind is None:
+        kind = get_audio_kind(path)
+    if audio is None:
+        audio = load_tags_object(path, kind=kind)
 
     if kind == "mp3":
-        try:
-            id3 = ID3(path)
-        except ID3NoHeaderError:
-            return None
-        apics = id3.getall("APIC")
-        if not apics:
+        # Primer APIC por clave ("APIC:<desc>"), sin recorrer ni copiar el resto de frames
+        apic = next((audio[k] for k in audio.keys() if k.startswith("APIC")), None)
+        if apic is None:
             return None
-        data = apics[0].data
-        mime = apics[0].mime or guess_mime_from_bytes(data)
+        data = apic.data
+        mime = apic.mime or guess_mime_from_bytes(data)
         return data, mime
 
     if kind == "flac":
-        fl = FLAC(path)
+        fl = audio
         if not fl.pictures:
             return None
         pic = fl.pictures[0]
@@ -218,7 +406,7 @@ def get_cover_bytes(path: str) -> Optional[Tuple[bytes, str]]:
         return pic.data, mime
 
     if kind == "ogg":
-        og = OggVorbis(path)
+        og = audio
         # En Vorbis, las imágenes suelen ir en METADATA_BLOCK_PICTURE (base64 de FLAC Picture)
         b64 = None
         for k in ("metadata_block_picture", "METADATA_BLOCK_PICTURE"):
@@ -230,6 +418,7 @@ def get_cover_bytes(path: str) -> Optional[Tuple[bytes, str]]:
         if not b64:
             return None
         try:
+            from mutagen.flac import Picture
             raw = base64.b64decode(b64)
             pic = Picture(raw)
             mime = pic.mime or guess_mime_from_bytes(pic.data)
@@ -238,12 +427,14 @@ def get_cover_bytes(path: str) -> Optional[Tuple[bytes, str]]:
             return None
 
     if kind == "m4a":
-        mp = MP4(path)
+        mp = audio
         covr = mp.tags.get("covr") if mp.tags else None
         if not covr:
             return None
+        from mutagen.mp4 import MP4Cover
         cover = covr[0]
-        data = bytes(cover)
+        # MP4Cover ya es una subclase de bytes: se devuelve tal cual, sin copiar
+        data = cover
         # mutagen indica formato en MP4Cover.imageformat
         mime = "image/png" if getattr(cover, "imageformat", None) == MP4Cover.FORMAT_PNG else "image/jpeg"
         return data, mime
@@ -251,18 +442,539 @@ def get_cover_bytes(path: str) -> Optional[Tuple[bytes, str]]:
     return None
 
 
+class MutagenBackend:
+    """
+    Lector de tags + carátula usando mutagen (siempre disponible si mutagen lo está).
+    """
+    name = "mutagen"
+
+    def read(self, path: str, want_cover: bool = True) -> Tuple[Dict[str, str], Optional[Tuple[bytes, str]]]:
+        kind = get_audio_kind(path)
+        audio = load_tags_object(path, want_cover=want_cover, kind=kind)
+        tags = get_tags(path, audio, kind)
+        cover = get_cover_bytes(path, audio, kind) if want_cover else None
+        return tags, cover
+
+
+class TinyTagBackend:
+    """
+    Lector de tags + carátula usando tinytag: abre el archivo una sola vez
+    y parsea solo los bloques de metadatos. Solo lectura; para escribir se usa mutagen.
+    """
+    name = "tinytag"
+
+    def read(self, path: str, want_cover: bool = True) -> Tuple[Dict[str, str], Optional[Tuple[bytes, str]]]:
+        tag = TinyTag.get(path, image=want_cover)
+        out = {k: safe_str(getattr(tag, k, None)) for k, _ in CANON_FIELDS}
+        out["track"] = self._track_text(path, tag)
+
+        if not want_cover:
+            return out, None
+
+        data = None
+        mime = ""
+        images = getattr(tag, "images", None)
+        if images is not None:
+            # tinytag >= 2
+            img = images.any
+            if img is not None:
+                data, mime = img.data, img.mime_type or ""
+        else:
+            # tinytag 1.x
+            data = tag.get_image()
+
+        if not data:
+            return out, None
+        return out, (data, mime or guess_mime_from_bytes(data))
+
+    @staticmethod
+    def _track_text(path: str, tag) -> str:
+        """
+        Pista en el formato de get_tags (mutagen), armada solo con lo que ya
+        devolvió tinytag (número y total por separado), sin volver a abrir el
+        archivo. En FLAC/OGG el texto original puede diferir (ceros a la
+        izquierda, o TRACKTOTAL en un campo aparte, que aquí sale "n/total");
+        copiar tags siempre lee el origen con mutagen.
+        """
+        track = getattr(tag, "track", None)
+        total = getattr(tag, "track_total", None)
+        if not total or get_audio_kind(path) == "m4a":
+            # M4A: get_tags muestra solo el número de "trkn"
+            return safe_str(track)
+        return f"{track}/{total}" if track else ""
+
+
+def make_read_backend():
+    """
+    Elige el lector de metadatos para la vista previa: tinytag si está
+    instalado, si no mutagen.
+    """
+    if TinyTag is not None:
+        return TinyTagBackend()
+    return MutagenBackend()
+
+
+READ_BACKEND = make_read_backend()
+
+
+class InfoCache:
+    """
+    Caché LRU (thread-safe) de lo leído por READ_BACKEND (tags + carátula), por
+    ruta y validada con (mtime, tamaño). A diferencia de functools.lru_cache permite
+    olvidar una ruta concreta (discard) tras escribir en ella: con padding el
+    tamaño no cambia y en algunos sistemas de archivos el mtime tampoco.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[Tuple[int, int], tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, stamp: Tuple[int, int]):
+        with self._lock:
+            entry = self._data.get(path)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._data.move_to_end(path)
+            return entry[1]
+
+    def put(self, path: str, stamp: Tuple[int, int], value: tuple):
+        with self._lock:
+            self._data[path] = (stamp, value)
+            self._data.move_to_end(path)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, path: str):
+        with self._lock:
+            self._data.pop(path, None)
+
+
+# Las carátulas pueden pesar varios MB: por eso el límite es moderado.
+INFO_CACHE = InfoCache(128)
+
+
+class TagsDiskCache:
+    """
+    Caché persistente (SQLite) de tags de texto por (ruta, mtime, tamaño),
+    para no volver a parsear la biblioteca en cada inicio.
+    Las escrituras se confirman por tandas (COMMIT_EVERY filas o
+    COMMIT_INTERVAL segundos; MainWindow llama a commit() periódicamente),
+    así que la transacción de escritura nunca queda abierta toda la sesión.
+    En modo WAL otra instancia de la app puede leer mientras esta escribe, y
+    un cierre inesperado pierde como mucho la última tanda.
+    """
+
+    COMMIT_EVERY = 200
+    COMMIT_INTERVAL = 5.0  # segundos
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        # timeout: esperar (en vez de fallar) si otra instancia está confirmando
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            db_path, timeout=5.0, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tags ("
+            "path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, data TEXT)"
+        )
+        self._conn.commit()
+        self._pending = 0
+        self._pending_since = 0.0
+
+    def get(self, path: str, stamp: Tuple[int, int]) -> Optional[Dict[str, str]]:
+        with self._lock:
+            if self._conn is None:
+                return None
+            row = self._conn.execute(
+                "SELECT data FROM tags WHERE path = ? AND mtime = ? AND size = ?",
+                (path, stamp[0], stamp[1]),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, path: str, stamp: Tuple[int, int], tags: Dict[str, str]):
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tags (path, mtime, size, data) VALUES (?, ?, ?, ?)",
+                (path, stamp[0], stamp[1], json.dumps(tags, ensure_ascii=False)),
+            )
+            self._written(force=False)
+
+    def _written(self, force: bool):
+        # Llamar con self._lock tomado
+        now = time.monotonic()
+        if self._pending == 0:
+            self._pending_since = now
+        self._pending += 1
+        if force or self._pending >= self.COMMIT_EVERY or now - self._pending_since >= self.COMMIT_INTERVAL:
+            self._conn.commit()
+            self._pending = 0
+
+    def discard(self, path: str):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM tags WHERE path = ?", (path,))
+                # Tras escribir en el archivo: que otra instancia no vea tags viejos
+                self._written(force=True)
+
+    def commit(self):
+        """Confirma lo pendiente. No espera: si otro hilo está escribiendo, lo hará él."""
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self._conn is not None and self._pending:
+                self._conn.commit()
+                self._pending = 0
+        finally:
+            self._lock.release()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+
+class TagsCache:
+    """
+    Caché LRU (thread-safe) solo de tags de texto, por ruta y validada con
+    (mtime, tamaño). Es barata (sin carátulas), así que puede guardar carpetas
+    enteras escaneadas en segundo plano.
+    Opcionalmente respaldada por un TagsDiskCache (ver attach_disk).
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk: Optional[TagsDiskCache] = None
+
+    def attach_disk(self, disk: Optional[TagsDiskCache]):
+        self.disk = disk
+
+    def get(self, path: str, stamp: Optional[Tuple[int, int]] = None) -> Optional[Dict[str, str]]:
+        """
+        Devuelve los tags guardados para `path`. Con stamp=None no se valida
+        contra el disco (sirve para mostrar algo al instante, sin stat) y
+        tampoco se consulta la caché persistente.
+        """
+        with self._lock:
+            entry = self._data.get(path)
+            if entry is not None and (stamp is None or entry[0] == stamp):
+                self._data.move_to_end(path)
+                return entry[1]
+        if stamp is None or self.disk is None:
+            return None
+        try:
+            tags = self.disk.get(path, stamp)
+        except (sqlite3.Error, ValueError):
+            # La caché en disco es opcional: un fallo (bloqueo, archivo dañado)
+            # equivale a no tener el dato
+            return None
+        if tags is not None:
+            self._put_memory(path, stamp, tags)
+        return tags
+
+    def put(self, path: str, stamp: Tuple[int, int], tags: Dict[str, str]):
+        with self._lock:
+            entry = self._data.get(path)
+            if entry is not None and entry[0] == stamp and entry[1] is tags:
+                # Ya guardado (p.ej. acierto de la caché de read_info)
+                self._data.move_to_end(path)
+                return
+        self._put_memory(path, stamp, tags)
+        if self.disk is not None:
+            try:
+                self.disk.put(path, stamp, tags)
+            except sqlite3.Error:
+                pass
+
+    def discard(self, path: str):
+        with self._lock:
+            self._data.pop(path, None)
+        if self.disk is not None:
+            try:
+                self.disk.discard(path)
+            except sqlite3.Error:
+                pass
+
+    def _put_memory(self, path: str, stamp: Tuple[int, int], tags: Dict[str, str]):
+        with self._lock:
+            self._data[path] = (stamp, tags)
+            self._data.move_to_end(path)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+TAGS_CACHE = TagsCache(4096)
+
+
+class CoverThumbCache:
+    """
+    Caché persistente de carátulas ya escaladas (PNG), una por (ruta, lado),
+    para que tras reiniciar no haga falta volver a extraer y decodificar la
+    imagen. El nombre del archivo sale de la ruta; el (mtime, tamaño) va dentro
+    del PNG (texto "stamp") y se valida al leer.
+    Sin carpeta asignada (attach_dir) no hace nada.
+    """
+
+    def __init__(self):
+        self.dir: Optional[str] = None
+
+    def attach_dir(self, path: Optional[str]):
+        self.dir = path
+
+    def _prefix(self, path: str) -> str:
+        return hashlib.blake2b(path.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+    def _file(self, path: str, side: int) -> str:
+        return os.path.join(self.dir, f"{self._prefix(path)}-{side}.png")
+
+    def get(self, path: str, stamp: Tuple[int, int], side: int) -> Optional[QImage]:
+        if self.dir is None:
+            return None
+        img = QImage()
+        if not img.load(self._file(path, side), "PNG"):
+            return None
+        if img.text("stamp") != f"{stamp[0]}:{stamp[1]}":
+            return None
+        return img
+
+    def put(self, path: str, stamp: Tuple[int, int], side: int, img: QImage):
+        if self.dir is None or img.isNull():
+            return
+        dst = self._file(path, side)
+        tmp = f"{dst}.{threading.get_ident()}.tmp"
+        img = img.copy()  # setText modifica la imagen: no tocar la que usa la UI
+        img.setText("stamp", f"{stamp[0]}:{stamp[1]}")
+        try:
+            if img.save(tmp, "PNG"):
+                os.replace(tmp, dst)
+        except OSError:
+            pass
+        finally:
+            if os.path.exists(tmp):
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+
+    def discard(self, path: str):
+        if self.dir is None:
+            return
+        prefix = self._prefix(path) + "-"
+        try:
+            with os.scandir(self.dir) as it:
+                names = [e.name for e in it if e.name.startswith(prefix)]
+        except OSError:
+            return
+        for name in names:
+            try:
+                os.remove(os.path.join(self.dir, name))
+            except OSError:
+                pass
+
+    def prune(self, max_files: int):
+        """Deja como mucho max_files miniaturas (borra las más antiguas)."""
+        if self.dir is None:
+            return
+        try:
+            with os.scandir(self.dir) as it:
+                entries = [(e.stat().st_mtime_ns, e.path) for e in it if e.name.endswith(".png")]
+        except OSError:
+            return
+        if len(entries) <= max_files:
+            return
+        entries.sort()
+        for _mtime, p in entries[: len(entries) - max_files]:
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+
+COVER_THUMBS = CoverThumbCache()
+
+
+def file_stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def read_info(
+    path: str, stamp: Optional[Tuple[int, int]] = None
+) -> Tuple[Dict[str, str], Optional[Tuple[bytes, str]]]:
+    """
+    Lee (tags, carátula) con caché LRU por (ruta, mtime, tamaño): volver a un
+    archivo ya visto no lo vuelve a abrir, y si el archivo cambia (p.ej. al
+    copiarle una carátula) la clave cambia y se relee.
+    stamp: (mtime, tamaño) si el llamador ya hizo el stat.
+    El dict devuelto es compartido: no modificarlo.
+    """
+    if stamp is None:
+        stamp = file_stamp(path)
+    info = INFO_CACHE.get(path, stamp)
+    if info is None:
+        info = READ_BACKEND.read(path)
+        INFO_CACHE.put(path, stamp, info)
+    tags, cover = info
+    TAGS_CACHE.put(path, stamp, tags)
+    return tags, cover
+
+
+def forget_cached_info(path: str):
+    """Olvida lo cacheado de `path` (llamar después de escribir en él)."""
+    INFO_CACHE.discard(path)
+    TAGS_CACHE.discard(path)
+    COVER_THUMBS.discard(path)
+
+
+def _invalidates_info(func):
+    """Decorador para funciones de escritura: invalida las cachés de la ruta."""
+    @functools.wraps(func)
+    def wrapper(path: str, *args, **kwargs):
+        try:
+            return func(path, *args, **kwargs)
+        finally:
+            forget_cached_info(path)
+    return wrapper
+
+
+def scan_tags(path: str):
+    """
+    Lee solo los tags de texto (sin carátula) y los guarda en TAGS_CACHE,
+    si no están ya al día.
+    """
+    stamp = file_stamp(path)
+    if TAGS_CACHE.get(path, stamp) is not None:
+        return
+    tags, _cover = READ_BACKEND.read(path, want_cover=False)
+    TAGS_CACHE.put(path, stamp, tags)
+
+
+def cover_padding(cover_len: int):
+    """
+    Callback de padding para mutagen al guardar una carátula.
+
+    Si la etiqueta nueva cabe en el espacio actual se conserva todo el padding:
+    la política por defecto de mutagen lo recorta cuando sobra mucho (p.ej. al
+    cambiar una carátula grande por una pequeña) y eso obliga a reescribir el
+    archivo completo. Si no cabe, se reescribe una vez dejando margen
+    (8 KiB o 1/4 de la carátula) para que la siguiente copia se haga en el sitio.
+    Coste: algunos KB/cientos de KB de padding vacío por archivo.
+    """
+    headroom = max(8192, cover_len // 4)
+
+    def _padding(info) -> int:
+        if info.padding >= 0:
+            return info.padding
+        return headroom
+
+    return _padding
+
+
+def keep_padding(info) -> int:
+    """
+    Callback de padding para mutagen al guardar tags de texto: si caben en el
+    espacio actual se conserva todo el padding (incluido el margen que dejó
+    cover_padding al copiar una carátula), así que solo se reescribe el
+    bloque de tags. Si no caben se usa la política por defecto de mutagen.
+    """
+    if info.padding >= 0:
+        return info.padding
+    return info.get_default_padding()
+
+
+class _NeedsRewrite(Exception):
+    """Interno de save_tags_object: guardar cambiaría el tamaño del archivo."""
+
+
+def save_tags_object(obj, path: str, padding=None) -> None:
+    """
+    Guarda un objeto mutagen (ID3, FLAC, OggVorbis, MP4) en `path`.
+
+    Si la etiqueta nueva ocupa lo mismo que la actual (cabe en el padding) se
+    escribe en el sitio: solo cambia el bloque de tags. Si no, mutagen tendría
+    que desplazar el audio dentro del mismo archivo y un corte a medias lo
+    dejaría truncado; en ese caso se guarda sobre una copia temporal en la
+    misma carpeta, se hace fsync y se reemplaza el original con os.replace.
+    La copia conserva permisos, atributos (shutil.copystat) y, donde se puede,
+    dueño y grupo (os.chown). Costes de ese camino: el archivo se escribe dos
+    veces (la copia y luego la reescritura de mutagen sobre ella); el resultado
+    es un inodo nuevo, así que los hardlinks al original dejan de compartirlo;
+    y en Windows os.replace falla si otro programa tiene el archivo abierto
+    (se borra la copia y se avisa con PermissionError; el original queda igual).
+    padding: callback de padding de mutagen (None = política por defecto).
+    """
+    def in_place_only(info) -> int:
+        new = padding(info) if padding is not None else info.get_default_padding()
+        if new != info.padding:
+            raise _NeedsRewrite()
+        return new
+
+    try:
+        obj.save(path, padding=in_place_only)
+        return
+    except _NeedsRewrite:
+        pass
+
+    folder, name = os.path.split(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=folder or None)
+    os.close(fd)
+    try:
+        shutil.copyfile(path, tmp)
+        # Antes de guardar: así la fecha de modificación queda la del guardado
+        shutil.copystat(path, tmp)
+        if hasattr(os, "chown"):
+            st = os.stat(path)
+            try:
+                os.chown(tmp, st.st_uid, st.st_gid)
+            except OSError:
+                # Sin permiso para cambiar el dueño (archivo de otro usuario)
+                pass
+        obj.save(tmp, padding=padding)
+        with open(tmp, "rb+") as f:
+            os.fsync(f.fileno())
+        try:
+            os.replace(tmp, path)
+        except PermissionError as e:
+            raise PermissionError(
+                f"No se pudo reemplazar {name}: el archivo está abierto en otro "
+                "programa o no se puede modificar. No se cambió nada."
+            ) from e
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@_invalidates_info
 def set_cover_bytes(path: str, data: bytes, mime: str) -> None:
     """
     Escribe carátula embebida en el archivo destino.
     Limpia carátulas previas y deja una principal.
+    El MIME se deduce de los bytes; `mime` solo se usa si la firma no se reconoce
+    (el MIME declarado en el archivo origen no siempre es correcto).
+    Si el archivo ya tiene exactamente esa carátula no se reescribe.
     """
     kind = get_audio_kind(path)
+    mime = sniff_image_mime(data) or mime or "image/jpeg"
 
     if kind == "mp3":
         try:
             id3 = ID3(path)
         except ID3NoHeaderError:
             id3 = ID3()
+        apics = id3.getall("APIC")
+        if len(apics) == 1 and apics[0].mime == mime and apics[0].data == data:
+            return
         # Limpiar APIC existentes
         for frame in id3.getall("APIC"):
             id3.delall("APIC")
@@ -270,140 +982,135 @@ def set_cover_bytes(path: str, data: bytes, mime: str) -> None:
         id3.add(
             APIC(
                 encoding=3,   # UTF-8
-                mime=mime or guess_mime_from_bytes(data),
+                mime=mime,
                 type=3,       # Cover (front)
                 desc="Cover",
                 data=data,
             )
         )
-        id3.save(path)
+        save_tags_object(id3, path, cover_padding(len(data)))
         return
 
     if kind == "flac":
+        from mutagen.flac import FLAC, Picture
         fl = FLAC(path)
+        pics = fl.pictures
+        if len(pics) == 1 and pics[0].mime == mime and pics[0].data == data:
+            return
         fl.clear_pictures()
         pic = Picture()
         pic.type = 3
-        pic.mime = mime or guess_mime_from_bytes(data)
+        pic.mime = mime
         pic.desc = "Cover"
         pic.data = data
         fl.add_picture(pic)
-        fl.save()
+        save_tags_object(fl, path, cover_padding(len(data)))
         return
 
     if kind == "ogg":
+        from mutagen.flac import Picture
+        from mutagen.oggvorbis import OggVorbis
         og = OggVorbis(path)
         pic = Picture()
         pic.type = 3
-        pic.mime = mime or guess_mime_from_bytes(data)
+        pic.mime = mime
         pic.desc = "Cover"
         pic.data = data
         b64 = base64.b64encode(pic.write()).decode("ascii")
+        if og.tags is not None and og.tags.get("METADATA_BLOCK_PICTURE") == [b64]:
+            return
         # limpiar ambos keys posibles
         for k in ("metadata_block_picture", "METADATA_BLOCK_PICTURE"):
             if k in og.tags:
                 del og.tags[k]
         og.tags["METADATA_BLOCK_PICTURE"] = [b64]
-        og.save()
+        save_tags_object(og, path, cover_padding(len(data)))
         return
 
     if kind == "m4a":
+        from mutagen.mp4 import MP4, MP4Cover
         mp = MP4(path)
         if mp.tags is None:
             mp.add_tags()
-        fmt = MP4Cover.FORMAT_PNG if (mime or "").lower().endswith("png") else MP4Cover.FORMAT_JPEG
+        fmt = MP4Cover.FORMAT_PNG if mime.lower().endswith("png") else MP4Cover.FORMAT_JPEG
+        covr = mp.tags.get("covr")
+        if covr and len(covr) == 1 and covr[0].imageformat == fmt and bytes(covr[0]) == data:
+            return
         mp.tags["covr"] = [MP4Cover(data, imageformat=fmt)]
-        mp.save()
+        save_tags_object(mp, path, cover_padding(len(data)))
         return
 
     raise RuntimeError("Formato no soportado para escribir carátula.")
 
 
-def get_tags(path: str) -> Dict[str, str]:
+def get_tags(path: str, audio=None, kind: Optional[str] = None) -> Dict[str, str]:
     """
     Retorna tags en campos canónicos:
     title, artist, album, year, track, genre, comment, albumartist, composer
+    audio/kind: objeto ya abierto con load_tags_object() y su tipo (opcionales).
     """
-    kind = get_audio_kind(path)
+    if kind is None:
+        kind = get_audio_kind(path)
     out = {k: "" for k, _ in CANON_FIELDS}
+    if audio is None:
+        audio = load_tags_object(path, want_cover=False, kind=kind)
 
     if kind == "mp3":
-        # EasyID3 maneja mapeo de frames comunes.
-        try:
-            audio = EasyID3(path)
-        except Exception:
-            audio = EasyID3()
-        out["title"] = safe_str(audio.get("title"))
-        out["artist"] = safe_str(audio.get("artist"))
-        out["album"] = safe_str(audio.get("album"))
-        out["year"] = safe_str(audio.get("date")) or safe_str(audio.get("year"))
-        out["track"] = safe_str(audio.get("tracknumber"))
-        out["genre"] = safe_str(audio.get("genre"))
-        out["comment"] = safe_str(audio.get("comment"))
-        out["albumartist"] = safe_str(audio.get("albumartist"))
-        out["composer"] = safe_str(audio.get("composer"))
-        return out
-
-    if kind == "flac":
-        fl = FLAC(path)
-        tags = fl.tags or {}
-        out["title"] = safe_str(tags.get("TITLE"))
-        out["artist"] = safe_str(tags.get("ARTIST"))
-        out["album"] = safe_str(tags.get("ALBUM"))
-        out["year"] = safe_str(tags.get("DATE"))
-        out["track"] = safe_str(tags.get("TRACKNUMBER"))
-        out["genre"] = safe_str(tags.get("GENRE"))
-        out["comment"] = safe_str(tags.get("COMMENT"))
-        out["albumartist"] = safe_str(tags.get("ALBUMARTIST"))
-        out["composer"] = safe_str(tags.get("COMPOSER"))
+        id3 = audio
+        for key, fid in ID3_TEXT_FRAMES.items():
+            frame = id3.get(fid)
+            if frame is None:
+                continue
+            # TCON: .genres traduce "(17)" -> "Rock"
+            out[key] = safe_str(frame.genres if fid == "TCON" else frame.text)
+        # Comentario principal (sin descripción); se ignoran COMM de iTunes, etc.
+        for frame in id3.getall("COMM"):
+            if not frame.desc:
+                out["comment"] = safe_str(frame.text)
+                break
         return out
 
-    if kind == "ogg":
-        og = OggVorbis(path)
-        tags = og.tags or {}
-        # VorbisComment suele ser case-insensitive; mutagen entrega keys normalizadas en el dict.
-        def g(key: str) -> str:
-            # intentar variantes
-            for k in (key, key.upper(), key.lower()):
-                if k in tags:
-                    return safe_str(tags.get(k))
-            return ""
-        out["title"] = g("TITLE")
-        out["artist"] = g("ARTIST")
-        out["album"] = g("ALBUM")
-        out["year"] = g("DATE")
-        out["track"] = g("TRACKNUMBER")
-        out["genre"] = g("GENRE")
-        out["comment"] = g("COMMENT")
-        out["albumartist"] = g("ALBUMARTIST")
-        out["composer"] = g("COMPOSER")
+    if kind in ("flac", "ogg"):
+        # VorbisComment es una lista de pares (clave, valor) con claves sin
+        # distinguir mayúsculas: cada tags.get() la recorre entera, así que se
+        # indexa una sola vez (primer valor de cada clave).
+        first: Dict[str, str] = {}
+        for k, v in audio.tags or ():
+            first.setdefault(k.upper(), v)
+        for field, key in VORBIS_FIELDS.items():
+            out[field] = safe_str(first.get(key))
         return out
 
     if kind == "m4a":
-        mp = MP4(path)
-        tags = mp.tags or {}
-        out["title"] = safe_str(tags.get("\xa9nam"))
-        out["artist"] = safe_str(tags.get("\xa9ART"))
-        out["album"] = safe_str(tags.get("\xa9alb"))
-        out["year"] = safe_str(tags.get("\xa9day"))
+        tags = audio.tags or {}
+        for field, atom in MP4_TEXT_FIELDS.items():
+            out[field] = safe_str(tags.get(atom))
         trkn = tags.get("trkn")
-        if trkn and isinstance(trkn, list) and trkn and isinstance(trkn[0], tuple):
-            out["track"] = str(trkn[0][0]) if trkn[0][0] else ""
-        else:
-            out["track"] = ""
-        out["genre"] = safe_str(tags.get("\xa9gen"))
-        out["comment"] = safe_str(tags.get("\xa9cmt"))
-        out["albumartist"] = safe_str(tags.get("aART"))
-        out["composer"] = safe_str(tags.get("\xa9wrt"))
+        if trkn and isinstance(trkn, list) and isinstance(trkn[0], tuple) and trkn[0][0]:
+            out["track"] = str(trkn[0][0])
         return out
 
     return out
 
 
+def _set_vorbis_fields(vc, t: Dict[str, str]) -> None:
+    """
+    Reemplaza los campos canónicos de un VorbisComment (lista de pares
+    (clave, valor)) en una sola pasada: cada del/asignación por clave recorre
+    la lista entera. Las demás claves se conservan; los campos vacíos se borran.
+    """
+    kept = [(k, v) for k, v in vc if k.lower() not in _VORBIS_KEYS_LOWER]
+    kept.extend((key, t[field]) for field, key in VORBIS_FIELDS.items() if t[field])
+    vc[:] = kept
+
+
+@_invalidates_info
 def set_tags(path: str, tags_in: Dict[str, str]) -> None:
     """
     Escribe tags desde el dict canónico.
     Respeta campos vacíos: si está vacío, limpia ese tag del destino.
+    Si el destino ya tiene esos valores no se reescribe (guardar puede
+    reescribir el archivo entero).
     """
     kind = get_audio_kind(path)
 
@@ -414,84 +1121,44 @@ def set_tags(path: str, tags_in: Dict[str, str]) -> None:
 
     if kind == "mp3":
         try:
-            audio = EasyID3(path)
-        except Exception:
-            audio = EasyID3()
-        def set_or_del(key: str, val: str):
-            if val:
-                audio[key] = [val]
-            else:
-                if key in audio:
-                    del audio[key]
-
-        set_or_del("title", t["title"])
-        set_or_del("artist", t["artist"])
-        set_or_del("album", t["album"])
-        # Usamos "date" para año
-        set_or_del("date", t["year"])
-        set_or_del("tracknumber", t["track"])
-        set_or_del("genre", t["genre"])
-        set_or_del("comment", t["comment"])
-        set_or_del("albumartist", t["albumartist"])
-        set_or_del("composer", t["composer"])
-
-        audio.save(path)
-        return
+            id3 = ID3(path)
+        except ID3NoHeaderError:
+            id3 = ID3()
+        if get_tags(path, audio=id3, kind=kind) == t:
+            return
 
-    if kind == "flac":
-        fl = FLAC(path)
-        if fl.tags is None:
-            fl.add_tags()
+        for key, fid in ID3_TEXT_FRAMES.items():
+            id3.delall(fid)
+            if t[key]:
+                id3.add(Frames[fid](encoding=3, text=[t[key]]))
 
-        def set_or_del(key: str, val: str):
-            if val:
-                fl.tags[key] = [val]
-            else:
-                if key in fl.tags:
-                    del fl.tags[key]
-
-        set_or_del("TITLE", t["title"])
-        set_or_del("ARTIST", t["artist"])
-        set_or_del("ALBUM", t["album"])
-        set_or_del("DATE", t["year"])
-        set_or_del("TRACKNUMBER", t["track"])
-        set_or_del("GENRE", t["genre"])
-        set_or_del("COMMENT", t["comment"])
-        set_or_del("ALBUMARTIST", t["albumartist"])
-        set_or_del("COMPOSER", t["composer"])
-
-        fl.save()
+        # Comentario principal (sin descripción)
+        for frame in id3.getall("COMM"):
+            if not frame.desc:
+                id3.delall(frame.HashKey)
+        if t["comment"]:
+            id3.add(COMM(encoding=3, lang="eng", desc="", text=[t["comment"]]))
+
+        save_tags_object(id3, path, keep_padding)
         return
 
-    if kind == "ogg":
-        og = OggVorbis(path)
-        if og.tags is None:
-            og.add_tags()
-
-        def set_or_del(key: str, val: str):
-            # VorbisComment usa keys típicamente en MAYÚSCULAS.
-            k = key.upper()
-            if val:
-                og.tags[k] = [val]
-            else:
-                if k in og.tags:
-                    del og.tags[k]
-
-        set_or_del("TITLE", t["title"])
-        set_or_del("ARTIST", t["artist"])
-        set_or_del("ALBUM", t["album"])
-        set_or_del("DATE", t["year"])
-        set_or_del("TRACKNUMBER", t["track"])
-        set_or_del("GENRE", t["genre"])
-        set_or_del("COMMENT", t["comment"])
-        set_or_del("ALBUMARTIST", t["albumartist"])
-        set_or_del("COMPOSER", t["composer"])
-
-        og.save()
+    if kind in ("flac", "ogg"):
+        from mutagen.flac import FLAC
+        from mutagen.oggvorbis import OggVorbis
+        audio = FLAC(path) if kind == "flac" else OggVorbis(path)
+        if get_tags(path, audio=audio, kind=kind) == t:
+            return
+        if audio.tags is None:
+            audio.add_tags()
+        _set_vorbis_fields(audio.tags, t)
+        save_tags_object(audio, path, keep_padding)
         return
 
     if kind == "m4a":
+        from mutagen.mp4 import MP4
         mp = MP4(path)
+        if get_tags(path, audio=mp, kind=kind) == t:
+            return
         if mp.tags is None:
             mp.add_tags()
 
@@ -502,26 +1169,586 @@ def set_tags(path: str, tags_in: Dict[str, str]) -> None:
             else:
                 mp.tags[key] = val
 
-        set_or_del("\xa9nam", [t["title"]] if t["title"] else "")
-        set_or_del("\xa9ART", [t["artist"]] if t["artist"] else "")
-        set_or_del("\xa9alb", [t["album"]] if t["album"] else "")
-        set_or_del("\xa9day", [t["year"]] if t["year"] else "")
+        for field, atom in MP4_TEXT_FIELDS.items():
+            set_or_del(atom, [t[field]] if t[field] else "")
         # track: (tracknum, total) - aquí solo tracknum
         if t["track"].isdigit():
             set_or_del("trkn", [(int(t["track"]), 0)])
         else:
             set_or_del("trkn", "")
-        set_or_del("\xa9gen", [t["genre"]] if t["genre"] else "")
-        set_or_del("\xa9cmt", [t["comment"]] if t["comment"] else "")
-        set_or_del("aART", [t["albumartist"]] if t["albumartist"] else "")
-        set_or_del("\xa9wrt", [t["composer"]] if t["composer"] else "")
 
-        mp.save()
+        save_tags_object(mp, path, keep_padding)
         return
 
     raise RuntimeError("Formato no soportado para escribir tags.")
 
 
+# ---------- Copia de tags / carátula (origen -> destino) ----------
+# El origen se lee siempre con mutagen (no con READ_BACKEND): tinytag normaliza
+# algunos campos (p.ej. la pista "3/12" -> 3) y la copia no debe depender de
+# qué paquetes estén instalados.
+def copy_tags(src: str, dst: str) -> None:
+    set_tags(dst, get_tags(src))
+
+
+def copy_cover(src: str, dst: str) -> bool:
+    """Copia la carátula; devuelve False si el origen no tiene."""
+    cover = get_cover_bytes(src)
+    if not cover:
+        return False
+    data, mime = cover
+    set_cover_bytes(dst, data, mime)
+    return True
+
+
+# ---------- Lectura en segundo plano (QThreadPool) ----------
+class InfoLoaderSignals(QObject):
+    """
+    Señales de InfoLoader. Vive en el hilo de la UI, así que las conexiones
+    a los slots del panel son encoladas (thread-safe).
+
+    loaded(req_id, path, tags, cover, error)
+    cover: None o (clave, QImage) con la clave (hash, tamaño) de los bytes, o
+    (ruta, stamp) si salió de COVER_THUMBS; el QImage es None si el panel ya
+    tenía ese pixmap en caché.
+    """
+    loaded = pyqtSignal(int, str, object, object, bool)
+
+
+class InfoLoader(QRunnable):
+    """
+    Lee tags + carátula de un archivo fuera del hilo de la UI y publica
+    el resultado con InfoLoaderSignals.loaded. La carátula también se decodifica
+    y escala aquí (QImage es seguro fuera del hilo de la UI; QPixmap no).
+    """
+
+    def __init__(
+        self,
+        signals: InfoLoaderSignals,
+        req_id: int,
+        path: str,
+        cover_size: int,
+        cached_keys: frozenset = frozenset(),
+    ):
+        super().__init__()
+        self.signals = signals
+        self.req_id = req_id
+        self.path = path
+        self.cover_size = cover_size
+        # Claves (hash, tamaño, lado) de los pixmaps que el panel ya tiene
+        self.cached_keys = cached_keys
+
+    def run(self):
+        tags: Dict[str, str] = {}
+        cover = None
+        error = False
+        new_thumb: Optional[QImage] = None
+        try:
+            stamp = file_stamp(self.path)
+            hit = self._from_thumbs(stamp)
+            if hit is not None:
+                tags, cover = hit
+            else:
+                tags, raw = read_info(self.path, stamp=stamp)
+                if raw:
+                    data = raw[0]
+                    key = (hash(data), len(data))
+                    img = None
+                    if (*key, self.cover_size) not in self.cached_keys:
+                        img = new_thumb = decode_cover_image(data, self.cover_size)
+                    cover = (key, img)
+        except Exception:
+            error = True
+        try:
+            self.signals.loaded.emit(self.req_id, self.path, tags, cover, error)
+        except RuntimeError:
+            # El panel ya fue destruido (cierre de la aplicación)
+            return
+        if new_thumb is not None:
+            COVER_THUMBS.put(self.path, stamp, self.cover_size, new_thumb)
+
+    def _from_thumbs(self, stamp: Tuple[int, int]) -> Optional[tuple]:
+        """
+        (tags, (clave, QImage)) desde TAGS_CACHE y la miniatura en disco, sin
+        abrir el archivo de audio; None si falta alguno de los dos.
+        """
+        tags = TAGS_CACHE.get(self.path, stamp)
+        if tags is None:
+            return None
+        key = (self.path, stamp)
+        if (*key, self.cover_size) in self.cached_keys:
+            return tags, (key, None)
+        img = COVER_THUMBS.get(self.path, stamp, self.cover_size)
+        return (tags, (key, img)) if img is not None else None
+
+
+class PrefetchLoader(QRunnable):
+    """
+    Precarga (en la caché de read_info) los tags/carátula de un archivo vecino,
+    para que al bajar/subir con las flechas el siguiente ya esté leído.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+    def run(self):
+        try:
+            read_info(self.path)
+        except Exception:
+            pass
+
+
+class TagScanLoader(QRunnable):
+    """
+    Escanea en segundo plano los tags (sin carátula) de una tanda de archivos
+    de una carpeta recién cargada, para que al hacer clic se vean al instante.
+    """
+
+    def __init__(self, paths: list):
+        super().__init__()
+        self.paths = paths
+
+    def run(self):
+        for p in self.paths:
+            try:
+                scan_tags(p)
+            except Exception:
+                pass
+
+
+class CopyWorkerSignals(QObject):
+    """
+    Señales de CopyWorker (viven en el hilo de la UI).
+
+    done(func, src, dst, result, exc): exc es None si la copia terminó bien.
+    """
+    done = pyqtSignal(object, str, str, object, object)
+
+
+class CopyWorker(QRunnable):
+    """
+    Ejecuta func(origen, destino) (copy_cover/copy_tags) fuera del hilo de la
+    UI: guardar puede reescribir el archivo entero.
+    """
+
+    def __init__(self, signals: CopyWorkerSignals, func, src: str, dst: str):
+        super().__init__()
+        self.signals = signals
+        self.func = func
+        self.src = src
+        self.dst = dst
+
+    def run(self):
+        result = None
+        exc = None
+        try:
+            result = self.func(self.src, self.dst)
+        except Exception as e:
+            exc = e
+        try:
+            self.signals.done.emit(self.func, self.src, self.dst, result, exc)
+        except RuntimeError:
+            # La ventana ya fue destruida (cierre de la aplicación)
+            pass
+
+
+# ---------- Modelo de archivos (os.scandir) ----------
+_NATURAL_SPLIT = re.compile(r"(\d+)")
+
+
+def natural_key(name: str) -> list:
+    # "2 - x.mp3" antes que "10 - y.mp3" (orden natural, como el explorador)
+    return [int(t) if t.isdigit() else t for t in _NATURAL_SPLIT.split(name.lower())]
+
+
+class _FsNode:
+    """
+    Nodo del árbol de AudioFileModel. children es None hasta que la carpeta
+    se lee; size/mtime se leen (os.stat) solo cuando se necesitan, salvo en
+    Windows, donde ya vienen del listado.
+    """
+    __slots__ = ("path", "name", "is_dir", "parent", "row", "children", "_stat")
+
+    def __init__(self, path: str, name: str, is_dir: bool, parent: Optional["_FsNode"]):
+        self.path = path
+        self.name = name
+        self.is_dir = is_dir
+        self.parent = parent
+        self.row = 0
+        self.children: Optional[list] = None
+        self._stat: Optional[Tuple[int, float]] = None
+
+    def stat(self) -> Tuple[int, float]:
+        if self._stat is None:
+            try:
+                st = os.stat(self.path)
+                self._stat = (st.st_size, st.st_mtime)
+            except OSError:
+                self._stat = (0, 0.0)
+        return self._stat
+
+
+class AudioFileModel(QAbstractItemModel):
+    """
+    Modelo de solo lectura con las carpetas y los archivos de audio que hay
+    bajo una carpeta raíz (columnas Name, Size, Type, Date Modified).
+
+    A diferencia de QFileSystemModel + setNameFilters, cada carpeta se lee
+    con os.scandir solo al expandirla (fetchMore), el filtro es por extensión
+    sobre el nombre (sin stat: el tipo sale de d_type) y el tamaño/fecha solo
+    se consultan para las filas que se pintan o al ordenar por esas columnas.
+
+    Las carpetas ya leídas se vigilan con QFileSystemWatcher: si cambian fuera
+    de la app (archivos nuevos, borrados o renombrados) se vuelven a leer y se
+    actualizan solo las filas que cambiaron.
+
+    directoryLoaded(str) se emite al leer una carpeta, igual que en QFileSystemModel.
+    """
+    directoryLoaded = pyqtSignal(str)
+
+    # Espera para agrupar ráfagas de cambios (p.ej. al copiar muchos archivos)
+    WATCH_DELAY_MS = 300
+
+    HEADERS = ("Name", "Size", "Type", "Date Modified")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root_path = ""
+        self._root = _FsNode("", "", True, None)
+        self._sort_column = 0
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        icons = QFileIconProvider()
+        self._dir_icon = icons.icon(QFileIconProvider.IconType.Folder)
+        self._file_icon = icons.icon(QFileIconProvider.IconType.File)
+        self._locale = QLocale()
+
+        # Carpetas leídas (ruta -> nodo) vigiladas por cambios externos
+        self._watched: Dict[str, _FsNode] = {}
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._changed_dirs: set = set()
+        self._watch_timer = QTimer(self)
+        self._watch_timer.setSingleShot(True)
+        self._watch_timer.setInterval(self.WATCH_DELAY_MS)
+        self._watch_timer.timeout.connect(self._apply_directory_changes)
+
+    # -------- Raíz / rutas --------
+    def setRootPath(self, path: str):
+        # La carpeta raíz se lee dentro del reset (sin señales de inserción)
+        self.beginResetModel()
+        self._root_path = path
+        self._root = _FsNode(path, "", True, None)
+        self._unwatch_all()
+        if path:
+            self._root.children = self._scan(self._root)
+            self._watch(self._root)
+        self.endResetModel()
+        if path:
+            self.directoryLoaded.emit(path)
+
+    def rootPath(self) -> str:
+        return self._root_path
+
+    def filePath(self, index: QModelIndex) -> str:
+        return self._node(index).path
+
+    def isDir(self, index: QModelIndex) -> bool:
+        return self._node(index).is_dir
+
+    def _find_node(self, path: str) -> Optional[_FsNode]:
+        # Baja desde la raíz leyendo las carpetas intermedias que falten
+        if not self._root_path:
+            return None
+        try:
+            rel = os.path.relpath(os.path.abspath(path), self._root_path)
+        except ValueError:
+            return None  # otra unidad (Windows)
+        if rel == ".":
+            return self._root
+        if rel == ".." or rel.startswith(".." + os.sep):
+            return None
+        node = self._root
+        for part in rel.split(os.sep):
+            if node.children is None:
+                self.fetchMore(self._index_of(node))
+            part = os.path.normcase(part)
+            for child in node.children or ():
+                if os.path.normcase(child.name) == part:
+                    node = child
+                    break
+            else:
+                return None
+        return node
+
+    def index_for_path(self, path: str) -> QModelIndex:
+        """
+        Índice (columna 0) de `path`, que debe estar bajo la raíz.
+        Devuelve un índice inválido si no existe o está fuera de la raíz.
+        """
+        node = self._find_node(path)
+        if node is None or node is self._root:
+            return QModelIndex()
+        return self._index_of(node)
+
+    def audio_files(self, folder: str) -> list:
+        """Rutas de los archivos de audio ya leídos de `folder`."""
+        node = self._find_node(folder)
+        if node is None or not node.children:
+            return []
+        return [c.path for c in node.children if not c.is_dir]
+
+    def refresh_path(self, path: str):
+        """Vuelve a leer tamaño/fecha de `path` (p.ej. tras escribirle tags)."""
+        node = self._find_node(path)
+        if node is None or node is self._root:
+            return
+        node._stat = None
+        self.dataChanged.emit(
+            self.createIndex(node.row, 1, node), self.createIndex(node.row, 3, node)
+        )
+
+    # -------- Estructura --------
+    def _node(self, index: QModelIndex) -> _FsNode:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _index_of(self, node: _FsNode) -> QModelIndex:
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column, self._node(parent).children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        p = index.internalPointer().parent
+        if p is None or p is self._root:
+            return QModelIndex()
+        return self.createIndex(p.row, 0, p)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        children = self._node(parent).children
+        return len(children) if children is not None else 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        node = self._node(parent)
+        if not node.is_dir or parent.column() > 0:
+            return False
+        # Carpeta sin leer: mostrar la flecha sin abrirla
+        return node.children is None or bool(node.children)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self._node(parent)
+        return node.is_dir and node.children is None and bool(node.path)
+
+    def fetchMore(self, parent: QModelIndex):
+        node = self._node(parent)
+        if not node.is_dir or node.children is not None:
+            return
+        children = self._scan(node)
+        if children:
+            self.beginInsertRows(parent, 0, len(children) - 1)
+            node.children = children
+            self.endInsertRows()
+        else:
+            node.children = children
+        self._watch(node)
+        self.directoryLoaded.emit(node.path)
+
+    # -------- Cambios externos (QFileSystemWatcher) --------
+    def _watch(self, node: _FsNode):
+        self._watched[node.path] = node
+        self._watcher.addPath(node.path)
+
+    def _unwatch_all(self):
+        self._watched.clear()
+        self._changed_dirs.clear()
+        dirs = self._watcher.directories()
+        if dirs:
+            self._watcher.removePaths(dirs)
+
+    def _unwatch_tree(self, node: _FsNode):
+        if node.children is None:
+            return
+        if self._watched.pop(node.path, None) is not None:
+            self._watcher.removePath(node.path)
+        for c in node.children:
+            if c.is_dir:
+                self._unwatch_tree(c)
+
+    def _on_directory_changed(self, path: str):
+        self._changed_dirs.add(path)
+        self._watch_timer.start()
+
+    def _apply_directory_changes(self):
+        changed, self._changed_dirs = self._changed_dirs, set()
+        for path in changed:
+            node = self._watched.get(path)
+            if node is not None and node.children is not None:
+                self._rescan(node)
+
+    def _rescan(self, node: _FsNode):
+        """Vuelve a leer una carpeta ya cargada y aplica solo las diferencias."""
+        if not os.path.isdir(node.path):
+            # La carpeta desapareció: la quita la relectura de su carpeta padre
+            return
+        parent = self._index_of(node)
+        fresh = {(c.name, c.is_dir): c for c in self._scan(node)}
+
+        # Filas que ya no existen (de abajo arriba para no mover las pendientes)
+        for row in range(len(node.children) - 1, -1, -1):
+            child = node.children[row]
+            if (child.name, child.is_dir) in fresh:
+                continue
+            self.beginRemoveRows(parent, row, row)
+            del node.children[row]
+            self.endRemoveRows()
+            if child.is_dir:
+                self._unwatch_tree(child)
+        for i, c in enumerate(node.children):
+            c.row = i
+
+        # Las que siguen: tamaño/fecha pueden haber cambiado
+        for child in node.children:
+            child._stat = fresh.pop((child.name, child.is_dir))._stat
+        if node.children:
+            self.dataChanged.emit(
+                self.createIndex(0, 1, node.children[0]),
+                self.createIndex(len(node.children) - 1, 3, node.children[-1]),
+            )
+
+        # Nuevas: se añaden al final y luego se reordena la carpeta
+        if fresh:
+            first = len(node.children)
+            self.beginInsertRows(parent, first, first + len(fresh) - 1)
+            for i, child in enumerate(fresh.values()):
+                child.row = first + i
+                node.children.append(child)
+            self.endInsertRows()
+            self.layoutAboutToBeChanged.emit()
+            old = self.persistentIndexList()
+            refs = [(i.internalPointer(), i.column()) for i in old]
+            self._sort_children(node.children)
+            self.changePersistentIndexList(old, [self.createIndex(n.row, c, n) for n, c in refs])
+            self.layoutChanged.emit()
+        self.directoryLoaded.emit(node.path)
+
+    def _scan(self, node: _FsNode) -> list:
+        dirs = []
+        files = []
+        try:
+            with os.scandir(node.path) as it:
+                for e in it:
+                    name = e.name
+                    # Ocultos fuera (como QDir sin Filter.Hidden)
+                    if name.startswith("."):
+                        continue
+                    st = None
+                    try:
+                        if os.name == "nt":
+                            # En Windows DirEntry.stat() sale del propio listado (sin E/S)
+                            st = e.stat()
+                            if st.st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN:
+                                continue
+                        is_dir = e.is_dir()
+                    except OSError:
+                        continue
+                    if is_dir:
+                        child = _FsNode(e.path, name, True, node)
+                        dirs.append(child)
+                    elif has_audio_ext(name):
+                        child = _FsNode(e.path, name, False, node)
+                        files.append(child)
+                    else:
+                        continue
+                    if st is not None:
+                        # Tamaño/fecha ya conocidos: las columnas no vuelven a hacer stat
+                        child._stat = (st.st_size, st.st_mtime)
+        except OSError:
+            return []
+        children = dirs + files
+        self._sort_children(children)
+        return children
+
+    # -------- Orden --------
+    def _sort_children(self, children: list):
+        col = self._sort_column
+        if col == 1:
+            key = lambda n: n.stat()[0]
+        elif col == 2:
+            key = lambda n: self._type_text(n).lower()
+        elif col == 3:
+            key = lambda n: n.stat()[1]
+        else:
+            key = lambda n: natural_key(n.name)
+        reverse = self._sort_order == Qt.SortOrder.DescendingOrder
+        # Carpetas siempre primero
+        dirs = sorted((c for c in children if c.is_dir), key=key, reverse=reverse)
+        files = sorted((c for c in children if not c.is_dir), key=key, reverse=reverse)
+        children[:] = dirs + files
+        for i, c in enumerate(children):
+            c.row = i
+
+    def _sort_tree(self, node: _FsNode):
+        if not node.children:
+            return
+        self._sort_children(node.children)
+        for c in node.children:
+            if c.children:
+                self._sort_tree(c)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        refs = [(i.internalPointer(), i.column()) for i in old]
+        self._sort_tree(self._root)
+        self.changePersistentIndexList(old, [self.createIndex(n.row, c, n) for n, c in refs])
+        self.layoutChanged.emit()
+
+    # -------- Datos --------
+    def _type_text(self, node: _FsNode) -> str:
+        if node.is_dir:
+            return "Folder"
+        return os.path.splitext(node.name)[1].lstrip(".").lower() + " File"
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return node.name
+            if col == 1:
+                return "" if node.is_dir else self._locale.formattedDataSize(node.stat()[0])
+            if col == 2:
+                return self._type_text(node)
+            if col == 3:
+                dt = QDateTime.fromSecsSinceEpoch(int(node.stat()[1]))
+                return self._locale.toString(dt, QLocale.FormatType.ShortFormat)
+        elif role == Qt.ItemDataRole.DecorationRole and col == 0:
+            return self._dir_icon if node.is_dir else self._file_icon
+        elif role == Qt.ItemDataRole.TextAlignmentRole and col == 1:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+
 # ---------- UI: Breadcrumb bar ----------
 class BreadcrumbBar(QWidget):
     """
@@ -539,6 +1766,13 @@ class BreadcrumbBar(QWidget):
         self._layout.setSpacing(2)
         self._path = ""
 
+        # Widgets reutilizables: [btn0, sep1, btn1, sep2, btn2, ...] + stretch final.
+        # Al cambiar de ruta solo se actualiza el texto y se ocultan los sobrantes.
+        self._btn_pool: list[QToolButton] = []
+        self._sep_pool: list[QLabel] = []  # _sep_pool[i] va antes de _btn_pool[i + 1]
+        self._shown_segments: Optional[Tuple[str, tuple]] = None
+        self._layout.addStretch(1)
+
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
 
     def setPath(self, path: str):
@@ -551,13 +1785,6 @@ class BreadcrumbBar(QWidget):
     def path(self) -> str:
         return self._path
 
-    def _clear(self):
-        while self._layout.count():
-            item = self._layout.takeAt(0)
-            w = item.widget()
-            if w:
-                w.deleteLater()
-
     def _is_windows_path(self, p: str) -> bool:
         # Detectar si parece ruta Windows: "C:\" o "C:/" o UNC "\\server\share"
         if p.startswith("\\\\"):
@@ -616,13 +1843,13 @@ class BreadcrumbBar(QWidget):
                 p = p / seg
             return str(p)
 
-    def _make_btn(self, text: str, full_path: str) -> QToolButton:
+    def _make_btn(self) -> QToolButton:
         b = QToolButton(self)
-        b.setText(text)
         b.setCursor(Qt.CursorShape.PointingHandCursor)
         b.setAutoRaise(True)
         b.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextOnly)
-        b.clicked.connect(lambda: self.pathClicked.emit(full_path))
+        # La ruta del segmento se guarda en el botón: se conecta una sola vez
+        b.clicked.connect(lambda checked=False, b=b: self.pathClicked.emit(b.property("fullPath")))
         return b
 
     def _make_sep(self) -> QLabel:
@@ -632,33 +1859,56 @@ class BreadcrumbBar(QWidget):
         lab.setObjectName("BreadcrumbSep")
         return lab
 
+    def _set_btn(self, i: int, text: str, full_path: str):
+        if i == len(self._btn_pool):
+            # Crecer el pool: separador + botón antes del stretch final
+            if i > 0:
+                sep = self._make_sep()
+                self._sep_pool.append(sep)
+                self._layout.insertWidget(self._layout.count() - 1, sep)
+            btn = self._make_btn()
+            self._btn_pool.append(btn)
+            self._layout.insertWidget(self._layout.count() - 1, btn)
+        btn = self._btn_pool[i]
+        btn.setText(text)
+        btn.setProperty("fullPath", full_path)
+        btn.show()
+        if i > 0:
+            self._sep_pool[i - 1].show()
+
     def _rebuild(self):
-        self._clear()
-        if not self._path or not os.path.exists(self._path):
-            # Mostrar algo simple
-            empty = QLabel("", self)
-            self._layout.addWidget(empty, 1)
+        # Sin stat: el panel solo pasa carpetas ya validadas (set_root_path)
+        if not self._path:
+            segments = None
+        else:
+            root, rest = self._segments(self._path)
+            segments = (root, tuple(rest))
+        if segments == self._shown_segments:
             return
+        self._shown_segments = segments
 
-        root, rest = self._segments(self._path)
-        acc = []  # acumulados desde root
-
-        # Botón root (drive o "/")
-        full_root = self._join(root, [])
-        root_text = root.rstrip("\\/") if (root.endswith("\\") or root.endswith("/")) else root
-        if not root_text:
-            root_text = root
+        used = 0
+        if segments is not None:
+            acc = []  # acumulados desde root
 
-        self._layout.addWidget(self._make_btn(root_text, full_root))
+            # Botón root (drive o "/")
+            full_root = self._join(root, [])
+            root_text = root.rstrip("\\/") if (root.endswith("\\") or root.endswith("/")) else root
+            if not root_text:
+                root_text = root
+            self._set_btn(0, root_text, full_root)
 
-        # Resto de segmentos
-        for i, seg in enumerate(rest):
-            self._layout.addWidget(self._make_sep())
-            acc.append(seg)
-            full = self._join(root, acc)
-            self._layout.addWidget(self._make_btn(seg, full))
+            # Resto de segmentos
+            for i, seg in enumerate(rest, start=1):
+                acc.append(seg)
+                self._set_btn(i, seg, self._join(root, acc))
+            used = len(rest) + 1
 
-        self._layout.addStretch(1)
+        # Ocultar los widgets sobrantes del pool
+        for btn in self._btn_pool[used:]:
+            btn.hide()
+        for sep in self._sep_pool[max(0, used - 1):]:
+            sep.hide()
 
 
 # ---------- UI: Panel (izquierdo/derecho) ----------
@@ -677,33 +1927,48 @@ class AudioPanel(QWidget):
     """
     selectionChanged = pyqtSignal()
 
+    # Archivos vecinos (arriba y abajo) a precargar tras cada selección
+    PREFETCH_NEIGHBORS = 4
+    # Escaneo de tags al cargar una carpeta: hilos y máximo de archivos por carpeta
+    SCAN_THREADS = 4
+    SCAN_MAX_FILES = 2000
+    # Carátulas ya escaladas (por contenido y tamaño) que se conservan
+    PIXMAP_CACHE_SIZE = 16
+    # Filas extra (arriba y abajo de las visibles) cuyos tags se escanean al hacer scroll
+    VISIBLE_SCAN_MARGIN = 20
+
     def _rebuild_roots_menu(self):
-        self.roots_menu.clear()
         roots = list_roots_for_platform()
+        # Se llama en cada apertura del menú: si las unidades no cambiaron, no rehacerlo
+        if roots == self._menu_roots:
+            return
+        self._menu_roots = roots
+        self.roots_menu.clear()
 
         if not roots:
             act = self.roots_menu.addAction("(sin unidades)")
             act.setEnabled(False)
             return
 
+        # La ruta va en act.data(); un único slot (roots_menu.triggered) para todas
         for r in roots:
             label = r
             act = self.roots_menu.addAction(label)
-            act.triggered.connect(lambda checked=False, path=r: self.set_root_path(path))
+            act.setData(r)
+
+    def _on_root_action(self, act: QAction):
+        path = act.data()
+        if path:
+            self.set_root_path(path)
 
     def __init__(self, settings: QSettings, key_prefix: str, parent=None):
         super().__init__(parent)
         self.settings = settings
         self.key_prefix = key_prefix
 
-        self.model = QFileSystemModel(self)
-        self.model.setRootPath(QDir.rootPath())
-        self.model.setFilter(QDir.Filter.AllDirs | QDir.Filter.NoDotAndDotDot | QDir.Filter.Files)
-
-        # Filtrar extensiones de audio
-        filters = ["*.mp3", "*.flac", "*.ogg", "*.m4a"]
-        self.model.setNameFilters(filters)
-        self.model.setNameFilterDisables(False)
+        # Carpetas + archivos de audio (os.scandir, carga perezosa)
+        self.model = AudioFileModel(self)
+        self.model.directoryLoaded.connect(self._on_directory_loaded)
 
         self.tree = QTreeView(self)
         self.tree.setModel(self.model)
@@ -748,6 +2013,8 @@ class AudioPanel(QWidget):
             v.setObjectName("TagValue")
             self.tag_value_labels[key] = v
             self.tags_form.addRow(QLabel(label + ":", self.tags_widget), v)
+        self._tag_label_pairs = tuple(self.tag_value_labels.items())
+        self._shown_tags: Optional[Dict[str, str]] = None
 
         info_container = QWidget(self)
         info_layout = QHBoxLayout(info_container)
@@ -767,6 +2034,7 @@ class AudioPanel(QWidget):
         self.splitter.addWidget(info_container)
         self.splitter.setStretchFactor(0, 5)
         self.splitter.setStretchFactor(1, 2)
+        self.splitter.splitterMoved.connect(self._on_splitter_moved)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(6, 6, 6, 6)
@@ -790,6 +2058,8 @@ class AudioPanel(QWidget):
         self.btn_roots.setMenu(self.roots_menu)
         self.btn_roots.aboutToShow = None  # no existe en QToolButton, así que hacemos esto:
         self.roots_menu.aboutToShow.connect(self._rebuild_roots_menu)
+        self.roots_menu.triggered.connect(self._on_root_action)
+        self._menu_roots: Optional[list] = None
         self._rebuild_roots_menu()
 
         topbar_layout.addWidget(self.btn_roots, 0)
@@ -800,113 +2070,296 @@ class AudioPanel(QWidget):
 
         # Estado actual
         self._cover_target_size = 220  # se ajusta desde menú “Tamaño carátula”
-        self._last_loaded_file = ""
+        self._restored_root = ""  # carpeta aplicada en restore_state
+        self._pending_restore: Tuple[str, int] = ("", 0)  # (archivo, scroll) a aplicar tras restore_state
+        self._pending_vscroll: Optional[int] = None  # scroll restaurado que espera al rango de la barra
+        # Identidad (hash, tamaño) de la carátula mostrada; los bytes no se guardan
+        self._cover_key: Optional[Tuple[int, int]] = None
+        self._pixmap_cache: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+        self._info_skipped = False  # True si se omitió leer el archivo seleccionado
+
+        # Lectura asíncrona de tags/carátula
+        self._info_req_id = 0
+        self._loader_signals = InfoLoaderSignals(self)
+        self._loader_signals.loaded.connect(self._on_info_loaded)
+
+        # Escaneo de tags de carpetas cargadas (solo texto, sin carátulas)
+        self._scan_pool = QThreadPool(self)
+        self._scan_pool.setMaxThreadCount(self.SCAN_THREADS)
+        self._scan_pool.setThreadPriority(QThread.Priority.LowPriority)
+
+        # Precarga de vecinos en un pool propio de baja prioridad
+        self._prefetch_dir = ""
+        self._prefetch_pool = QThreadPool(self)
+        self._prefetch_pool.setMaxThreadCount(2)
+        self._prefetch_pool.setThreadPriority(QThread.Priority.LowPriority)
+
+        # Escaneo de tags de las filas visibles al hacer scroll (agrupado con un temporizador)
+        self._visible_timer = QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.setInterval(100)
+        self._visible_timer.timeout.connect(self._scan_visible)
+        self.tree.verticalScrollBar().valueChanged.connect(lambda *_: self._visible_timer.start())
+        self.tree.expanded.connect(lambda *_: self._visible_timer.start())
+
+        # Temporizador para agrupar cambios de selección rápidos
+        self._pending_info_path = ""
+        self._info_timer = QTimer(self)
+        self._info_timer.setSingleShot(True)
+        self._info_timer.setInterval(120)
+        self._info_timer.timeout.connect(self._apply_pending_info)
 
     def set_cover_size(self, px: int):
-        self._cover_target_size = max(80, int(px))
-        self._refresh_cover(self.selected_file_path())
+        px = max(80, int(px))
+        if px == self._cover_target_size:
+            return
+        self._cover_target_size = px
+        if not self._apply_cover_pixmap():
+            # No hay pixmap a este tamaño: releer (normalmente desde la caché)
+            self._refresh_info(self.selected_file_path())
 
-    def set_root_path(self, path: str):
+    def set_root_path(self, path: str, known_dir: bool = False) -> bool:
+        """known_dir=True: el llamador ya comprobó que es una carpeta (sin stat)."""
         path = os.path.abspath(path)
-        if not os.path.isdir(path):
-            return
-        idx = self.model.index(path)
-        if idx.isValid():
-            self.tree.setRootIndex(idx)
-            self.breadcrumb.setPath(path)
+        if not known_dir:
+            st = safe_stat(path)
+            if st is None or not stat.S_ISDIR(st.st_mode):
+                return False
+        self._cancel_pending_vscroll()
+        self.model.setRootPath(path)
+        self.breadcrumb.setPath(path)
+        return True
 
     def root_path(self) -> str:
-        idx = self.tree.rootIndex()
-        return self.model.filePath(idx) if idx.isValid() else QDir.rootPath()
+        return self.model.rootPath() or QDir.rootPath()
 
     def selected_file_path(self) -> str:
         idxs = self.tree.selectionModel().selectedRows()
         if not idxs:
             return ""
-        p = self.model.filePath(idxs[0])
-        return p if is_audio_file(p) else ""
+        idx = idxs[0]
+        # El modelo solo lista carpetas y archivos de audio: sin stat
+        if self.model.isDir(idx):
+            return ""
+        return self.model.filePath(idx)
 
     def _on_double_clicked(self, index: QModelIndex):
-        path = self.model.filePath(index)
-        if os.path.isdir(path):
-            self.set_root_path(path)
+        if self.model.isDir(index):
+            self.set_root_path(self.model.filePath(index))
 
     def _on_selection_changed(self):
-        f = self.selected_file_path()
-        self._refresh_info(f)
+        # Debounce: al navegar rápido (flechas/ratón) solo se lee el último archivo
+        self._pending_info_path = self.selected_file_path()
+        self._info_timer.start()
         self.selectionChanged.emit()
 
+    def _apply_pending_info(self):
+        self._refresh_info(self._pending_info_path)
+
+    def _on_directory_loaded(self, path: str):
+        files = self.model.audio_files(path)[: self.SCAN_MAX_FILES]
+        # Repartir en tandas, una por hilo del pool
+        n = self.SCAN_THREADS
+        for i in range(n):
+            chunk = files[i::n]
+            if chunk:
+                self._scan_pool.start(TagScanLoader(chunk))
+
+    def _scan_visible(self):
+        """
+        Escanea los tags de las filas visibles (y un margen) que aún no estén en
+        TAGS_CACHE: cubre carpetas con más de SCAN_MAX_FILES archivos y
+        subcarpetas expandidas.
+        """
+        idx = self.tree.indexAt(QPoint(0, 0))
+        if not idx.isValid():
+            return
+        n = self.VISIBLE_SCAN_MARGIN
+        for _ in range(n):
+            above = self.tree.indexAbove(idx)
+            if not above.isValid():
+                break
+            idx = above
+
+        height = self.tree.viewport().height()
+        below_count = 0
+        paths = []
+        while idx.isValid() and below_count <= n:
+            if self.tree.visualRect(idx).top() > height:
+                below_count += 1
+            if not self.model.isDir(idx):
+                p = self.model.filePath(idx)
+                if TAGS_CACHE.get(p) is None:
+                    paths.append(p)
+            idx = self.tree.indexBelow(idx)
+
+        # Las tareas van al pool de escaneo, que limita los hilos (y archivos abiertos)
+        k = self.SCAN_THREADS
+        for i in range(k):
+            chunk = paths[i::k]
+            if chunk:
+                self._scan_pool.start(TagScanLoader(chunk))
+
     def _refresh_info(self, file_path: str):
-        self._refresh_cover(file_path)
-        self._refresh_tags(file_path)
+        # Cada petición tiene un id; los resultados de peticiones viejas se descartan
+        self._info_req_id += 1
+        if not file_path:
+            self._on_info_loaded(self._info_req_id, "", {}, None, False)
+            return
+        if not self._info_visible():
+            # Zona de carátula/tags colapsada: no se lee nada (ni vecinos)
+            # hasta que el usuario la vuelva a abrir (_on_splitter_moved)
+            self._info_skipped = True
+            return
+        # Tags ya escaneados: mostrarlos al instante mientras se lee la carátula
+        cached = TAGS_CACHE.get(file_path)
+        if cached is not None:
+            self._refresh_tags(cached)
+        # Una sola lectura (un solo open) para tags + carátula, en un hilo del pool
+        loader = InfoLoader(
+            self._loader_signals,
+            self._info_req_id,
+            file_path,
+            self._cover_target_size,
+            frozenset(self._pixmap_cache),
+        )
+        QThreadPool.globalInstance().start(loader)
+
+    def _on_info_loaded(self, req_id: int, file_path: str, tags, cover, error: bool):
+        if req_id != self._info_req_id:
+            return
+        self._info_skipped = False
+        self._refresh_cover(file_path, cover, error)
+        self._refresh_tags(tags)
+        if file_path:
+            self._prefetch_siblings(file_path)
+
+    def _prefetch_siblings(self, file_path: str):
+        idx = self.model.index_for_path(file_path)
+        if not idx.isValid():
+            return
+        parent = idx.parent()
+
+        # Cambio de carpeta: cancelar precargas pendientes de la anterior
+        folder = os.path.dirname(file_path)
+        if folder != self._prefetch_dir:
+            self._prefetch_pool.clear()
+            self._prefetch_dir = folder
+
+        row = idx.row()
+        n = self.PREFETCH_NEIGHBORS
+        for r in range(max(0, row - n), min(self.model.rowCount(parent), row + n + 1)):
+            if r == row:
+                continue
+            sib = self.model.index(r, 0, parent)
+            if self.model.isDir(sib):
+                continue
+            # El modelo solo contiene carpetas y archivos de audio
+            self._prefetch_pool.start(PrefetchLoader(self.model.filePath(sib)))
+
+    def _info_visible(self) -> bool:
+        # Si el usuario colapsó la zona de carátula/tags no hace falta leer el archivo
+        if not self.splitter.isVisible():
+            return True
+        return self.splitter.sizes()[1] > 0
+
+    def _on_splitter_moved(self, *_):
+        # La zona inferior volvió a ser visible: leer el archivo que se omitió
+        if self._info_skipped and self._info_visible():
+            self._refresh_info(self.selected_file_path())
 
-    def _refresh_cover(self, file_path: str):
+    def _refresh_cover(self, file_path: str, cover: Optional[tuple], error: bool = False):
+        self._cover_key = None
         self.cover_label.setText("Sin carátula")
         self.cover_label.setPixmap(QPixmap())
 
         if not file_path:
             return
-
-        try:
-            cover = get_cover_bytes(file_path)
-            if not cover:
-                self.cover_label.setText("Sin carátula")
-                return
-            data, _mime = cover
-            pix = QPixmap()
-            if not pix.loadFromData(data):
-                self.cover_label.setText("Carátula inválida")
-                return
-            scaled = pix.scaled(
-                QSize(self._cover_target_size, self._cover_target_size),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-            self.cover_label.setPixmap(scaled)
-        except Exception:
+        if error:
             self.cover_label.setText("Error al leer carátula")
+            return
+        if not cover:
+            return
 
-    def _refresh_tags(self, file_path: str):
-        for key, _ in CANON_FIELDS:
-            self.tag_value_labels[key].setText("")
+        # La imagen ya viene decodificada y escalada desde InfoLoader
+        key, img = cover
+        self._cover_key = key
+        if self._apply_cover_pixmap(img):
+            return
+        if img is None:
+            # El pixmap salió de la caché mientras se leía: releer y decodificar
+            self._refresh_info(file_path)
+            return
+        self.cover_label.setText("Carátula inválida")
 
-        if not file_path:
+    def _apply_cover_pixmap(self, img: Optional[QImage] = None) -> bool:
+        """
+        Muestra la carátula actual (self._cover_key) al tamaño actual. Sin img
+        se usa la caché de pixmaps; devuelve False si no está (hay que releer)
+        o si la imagen no es válida.
+        """
+        if self._cover_key is None:
+            return True
+        key = (*self._cover_key, self._cover_target_size)
+        pix = self._pixmap_cache.get(key)
+        if pix is None:
+            if img is None:
+                return False
+            if img.isNull():
+                self._cover_key = None
+                return False
+            pix = QPixmap.fromImage(img)
+            self._pixmap_cache[key] = pix
+            while len(self._pixmap_cache) > self.PIXMAP_CACHE_SIZE:
+                self._pixmap_cache.popitem(last=False)
+        self.cover_label.setPixmap(pix)
+        return True
+
+    def _refresh_tags(self, tags: Dict[str, str]):
+        # Los dicts de la caché son compartidos: el mismo objeto = mismo contenido
+        if tags is self._shown_tags:
             return
+        self._shown_tags = tags
+        for key, label in self._tag_label_pairs:
+            label.setText(tags.get(key, ""))
 
-        try:
-            tags = get_tags(file_path)
-            for key, _ in CANON_FIELDS:
-                self.tag_value_labels[key].setText(tags.get(key, ""))
-        except Exception:
-            # Mantener vacío; no romper UI.
-            pass
+    def cancel_background_work(self):
+        """Descarta escaneos y precargas en cola (las que ya corren terminan)."""
+        self._scan_pool.clear()
+        self._prefetch_pool.clear()
 
     # -------- Persistencia --------
-    def save_state(self):
-        prefix = self.key_prefix
-        self.settings.setValue(f"{prefix}/root_path", self.root_path())
-        self.settings.setValue(f"{prefix}/selected_file", self.selected_file_path())
+    def state_values(self) -> Dict[str, object]:
+        """
+        Claves a guardar del panel (dentro del grupo key_prefix). No escribe:
+        MainWindow junta todo y lo guarda de una vez al cerrar.
+        """
+        values: Dict[str, object] = {}
+        # La carpeta solo se escribe si cambió desde el inicio
+        root = self.root_path()
+        if root != self._restored_root:
+            values["root_path"] = root
+        values["selected_file"] = self.selected_file_path()
 
         # Scroll vertical
-        vs = self.tree.verticalScrollBar().value()
-        self.settings.setValue(f"{prefix}/vscroll", int(vs))
+        values["vscroll"] = int(self.tree.verticalScrollBar().value())
 
         # Ancho de columnas
         header = self.tree.header()
-        sizes = [header.sectionSize(i) for i in range(min(4, header.count()))]
-        self.settings.setValue(f"{prefix}/header_sizes", sizes)
+        values["header_sizes"] = [header.sectionSize(i) for i in range(min(4, header.count()))]
 
         # Splitter interno
-        self.settings.setValue(f"{prefix}/splitter_sizes", self.splitter.sizes())
+        values["splitter_sizes"] = self.splitter.sizes()
+        return values
 
     def restore_state(self, default_path: str):
+        """default_path: carpeta ya comprobada por MainWindow (no se vuelve a verificar)."""
         prefix = self.key_prefix
 
         root_path = self.settings.value(f"{prefix}/root_path", default_path, type=str)
-        if not root_path or not os.path.isdir(root_path):
-            root_path = default_path
-
-        self.set_root_path(root_path)
+        if not root_path or root_path == default_path or not self.set_root_path(root_path):
+            self.set_root_path(default_path, known_dir=True)
+        self._restored_root = self.root_path()
 
         # Header sizes
         sizes = self.settings.value(f"{prefix}/header_sizes", None)
@@ -928,153 +2381,182 @@ class AudioPanel(QWidget):
 
         # Selección + scroll: aplicar luego de que Qt procese layout/model
         selected_file = self.settings.value(f"{prefix}/selected_file", "", type=str)
-        vscroll = self.settings.value(f"{prefix}/vscroll", 0)
         try:
-            vscroll = int(vscroll)
-        except Exception:
-            vscroll = 0
-
-        def apply_late():
-            # seleccionar archivo si está dentro del root actual
-            if selected_file and os.path.exists(selected_file):
-                idx = self.model.index(selected_file)
-                if idx.isValid():
-                    self.tree.setCurrentIndex(idx)
-                    self.tree.scrollTo(idx, QTreeView.ScrollHint.PositionAtCenter)
+            vscroll = self.settings.value(f"{prefix}/vscroll", 0, type=int)
+        except TypeError:
+            vscroll = 0  # valor no numérico en el ini
+
+        self._pending_restore = (selected_file, vscroll)
+        # Evento encolado directo al slot (sin crear un QTimer)
+        QMetaObject.invokeMethod(self, "_apply_restored_selection", Qt.ConnectionType.QueuedConnection)
+
+    @pyqtSlot()
+    def _apply_restored_selection(self):
+        selected_file, vscroll = self._pending_restore
+        # seleccionar archivo si está dentro del root actual
+        # index_for_path solo encuentra archivos que el modelo listó (existentes)
+        if selected_file:
+            idx = self.model.index_for_path(selected_file)
+            if idx.isValid():
+                self.tree.setCurrentIndex(idx)
+                self.tree.scrollTo(idx, QTreeView.ScrollHint.PositionAtCenter)
+        bar = self.tree.verticalScrollBar()
+        if vscroll > bar.maximum():
+            # La vista calcula el rango en su layout diferido: aplicar el scroll
+            # cuando el rango lo admita (una vez) en vez de dejarlo recortado
+            self._pending_vscroll = vscroll
+            bar.rangeChanged.connect(self._on_vscroll_range_changed)
+            bar.actionTriggered.connect(self._cancel_pending_vscroll)
+        bar.setValue(vscroll)
+        # refrescar carátula/tags (ya, sin esperar al debounce)
+        self._info_timer.stop()
+        self._refresh_info(self.selected_file_path())
+
+    def _on_vscroll_range_changed(self, _minimum: int, maximum: int):
+        if maximum >= self._pending_vscroll:
+            vscroll = self._pending_vscroll
+            self._cancel_pending_vscroll()
             self.tree.verticalScrollBar().setValue(vscroll)
-            # refrescar carátula/tags
-            self._refresh_info(self.selected_file_path())
 
-        QTimer.singleShot(0, apply_late)
+    def _cancel_pending_vscroll(self, *_):
+        # Se llama al aplicar el scroll, si el usuario mueve la barra o al cambiar de carpeta
+        if self._pending_vscroll is None:
+            return
+        self._pending_vscroll = None
+        bar = self.tree.verticalScrollBar()
+        bar.rangeChanged.disconnect(self._on_vscroll_range_changed)
+        bar.actionTriggered.disconnect(self._cancel_pending_vscroll)
 
 
 # ---------- Tema oscuro profesional (palette + QSS crítico) ----------
-def apply_dark_theme(app: QApplication):
-    pal = QPalette()
+# QSS (incluye tus requisitos críticos). Constante: no se rearma en cada cambio de tema.
+_DARK_QSS = """
+QWidget {
+    font-size: 10.5pt;
+}
+
+QTreeView {
+    border: 1px solid rgba(255,255,255,0.08);
+    background: palette(Base);
+    alternate-background-color: palette(AlternateBase);
+}
+
+QLabel#CoverPreview {
+    border: 1px solid rgba(255,255,255,0.12);
+    border-radius: 6px;
+    padding: 6px;
+    background: rgba(255,255,255,0.03);
+}
+
+QLabel#TagValue {
+    color: palette(Text);
+}
+
+QLabel#BreadcrumbSep {
+    color: rgba(255,255,255,0.55);
+}
+
+QToolButton {
+    padding: 2px 6px;
+    border-radius: 6px;
+    color: palette(ButtonText);
+}
+QToolButton:hover {
+    background: rgba(255,255,255,0.08);
+}
+
+/* CRÍTICO: indicadores de checkbox en tablas (QTableWidget hereda de QTableView) */
+QTableView::indicator {
+    width: 14px;
+    height: 14px;
+    border: 1px solid rgba(255,255,255,0.40);
+    border-radius: 3px;
+}
+QTableView::indicator:unchecked {
+    background: rgba(180,180,180,0.25);
+}
+QTableView::indicator:checked {
+    background: rgba(80, 200, 120, 0.85);
+}
+
+/* Refuerzo específico para Windows: menú y botones */
+QMenuBar {
+    background-color: rgb(30,30,30);
+    color: rgb(220,220,220);
+}
+QMenuBar::item:selected {
+    background: rgba(255,255,255,0.12);
+}
+QMenu {
+    background-color: rgb(30,30,30);
+    color: rgb(220,220,220);
+}
+QMenu::item:selected {
+    background-color: rgba(255,255,255,0.15);
+}
+QPushButton {
+    color: rgb(220,220,220);
+}
+"""
 
-    window = QColor(30, 30, 30)
-    base = QColor(24, 24, 24)
-    alt_base = QColor(32, 32, 32)
-    text = QColor(220, 220, 220)
-    disabled = QColor(140, 140, 140)
-    button = QColor(45, 45, 45)
 
+# Colores del tema oscuro (QColor no necesita QApplication: se crean una vez)
+_DARK_COLORS = {
+    "window": QColor(30, 30, 30),
+    "base": QColor(24, 24, 24),
+    "alt_base": QColor(32, 32, 32),
+    "text": QColor(220, 220, 220),
+    "disabled": QColor(140, 140, 140),
+    "button": QColor(45, 45, 45),
+    "highlight": QColor(90, 90, 90),
+    "highlighted_text": QColor(255, 255, 255),
+    "link": QColor(90, 160, 255),
+    "link_visited": QColor(190, 130, 255),
+}
+
+_DARK_ROLES = (
     # Base
-    pal.setColor(QPalette.ColorRole.Window, window)
-    pal.setColor(QPalette.ColorRole.WindowText, text)
-    pal.setColor(QPalette.ColorRole.Base, base)
-    pal.setColor(QPalette.ColorRole.AlternateBase, alt_base)
-    pal.setColor(QPalette.ColorRole.Text, text)
-
+    (QPalette.ColorRole.Window, "window"),
+    (QPalette.ColorRole.WindowText, "text"),
+    (QPalette.ColorRole.Base, "base"),
+    (QPalette.ColorRole.AlternateBase, "alt_base"),
+    (QPalette.ColorRole.Text, "text"),
     # Botones
-    pal.setColor(QPalette.ColorRole.Button, button)
-    pal.setColor(QPalette.ColorRole.ButtonText, text)
-
+    (QPalette.ColorRole.Button, "button"),
+    (QPalette.ColorRole.ButtonText, "text"),
     # Tooltips
-    pal.setColor(QPalette.ColorRole.ToolTipBase, base)
-    pal.setColor(QPalette.ColorRole.ToolTipText, text)
-
+    (QPalette.ColorRole.ToolTipBase, "base"),
+    (QPalette.ColorRole.ToolTipText, "text"),
     # Selección
-    pal.setColor(QPalette.ColorRole.Highlight, QColor(90, 90, 90))
-    pal.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
-
+    (QPalette.ColorRole.Highlight, "highlight"),
+    (QPalette.ColorRole.HighlightedText, "highlighted_text"),
     # Links (CRÍTICO por tu requisito)
-    pal.setColor(QPalette.ColorRole.Link, QColor(90, 160, 255))
-    pal.setColor(QPalette.ColorRole.LinkVisited, QColor(190, 130, 255))
-
-    # Disabled (sin MenuText, porque no existe en Qt6)
-    pal.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text, disabled)
-    pal.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, disabled)
-    pal.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.WindowText, disabled)
-
-    app.setPalette(pal)
-
-    # QSS (incluye tus requisitos críticos)
-    qss = """
-    QWidget {
-        font-size: 10.5pt;
-    }
-
-    QTreeView {
-        border: 1px solid rgba(255,255,255,0.08);
-        background: palette(Base);
-        alternate-background-color: palette(AlternateBase);
-    }
-
-    QLabel#CoverPreview {
-        border: 1px solid rgba(255,255,255,0.12);
-        border-radius: 6px;
-        padding: 6px;
-        background: rgba(255,255,255,0.03);
-    }
-
-    QLabel#TagValue {
-        color: palette(Text);
-    }
-
-    QLabel#BreadcrumbSep {
-        color: rgba(255,255,255,0.55);
-    }
-
-    QToolButton {
-        padding: 2px 6px;
-        border-radius: 6px;
-        color: palette(ButtonText);
-    }
-    QToolButton:hover {
-        background: rgba(255,255,255,0.08);
-    }
-
-    /* CRÍTICO: indicadores de checkbox en tablas (QTableView/QTableWidget) */
-    QTableView::indicator:unchecked {
-        width: 14px;
-        height: 14px;
-        border: 1px solid rgba(255,255,255,0.40);
-        background: rgba(180,180,180,0.25);
-        border-radius: 3px;
-    }
-    QTableView::indicator:checked {
-        width: 14px;
-        height: 14px;
-        border: 1px solid rgba(255,255,255,0.40);
-        background: rgba(80, 200, 120, 0.85);
-        border-radius: 3px;
-    }
-    QTableWidget::indicator:unchecked {
-        width: 14px;
-        height: 14px;
-        border: 1px solid rgba(255,255,255,0.40);
-        background: rgba(180,180,180,0.25);
-        border-radius: 3px;
-    }
-    QTableWidget::indicator:checked {
-        width: 14px;
-        height: 14px;
-        border: 1px solid rgba(255,255,255,0.40);
-        background: rgba(80, 200, 120, 0.85);
-        border-radius: 3px;
-    }
-
-    /* Refuerzo específico para Windows: menú y botones */
-    QMenuBar {
-        background-color: rgb(30,30,30);
-        color: rgb(220,220,220);
-    }
-    QMenuBar::item:selected {
-        background: rgba(255,255,255,0.12);
-    }
-    QMenu {
-        background-color: rgb(30,30,30);
-        color: rgb(220,220,220);
-    }
-    QMenu::item:selected {
-        background-color: rgba(255,255,255,0.15);
-    }
-    QPushButton {
-        color: rgb(220,220,220);
-    }
-    """
-    app.setStyleSheet(qss)
+    (QPalette.ColorRole.Link, "link"),
+    (QPalette.ColorRole.LinkVisited, "link_visited"),
+)
+
+# Disabled (sin MenuText, porque no existe en Qt6)
+_DARK_DISABLED_ROLES = (
+    (QPalette.ColorRole.Text, "disabled"),
+    (QPalette.ColorRole.ButtonText, "disabled"),
+    (QPalette.ColorRole.WindowText, "disabled"),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _dark_palette() -> QPalette:
+    # Se construye una sola vez (requiere QApplication, por eso no va a nivel de módulo)
+    pal = QPalette()
+    for role, key in _DARK_ROLES:
+        pal.setColor(role, _DARK_COLORS[key])
+    for role, key in _DARK_DISABLED_ROLES:
+        pal.setColor(QPalette.ColorGroup.Disabled, role, _DARK_COLORS[key])
+    return pal
+
+
+def apply_dark_theme(app: QApplication):
+    app.setPalette(_dark_palette())
+    app.setStyleSheet(_DARK_QSS)
 
 
 def apply_light_theme(app: QApplication):
@@ -1084,27 +2566,123 @@ def apply_light_theme(app: QApplication):
 
 
 # ---------- Ventana principal ----------
+def _setting_unchanged(stored, value) -> bool:
+    """
+    True si `stored` (leído de QSettings en IniFormat) ya equivale a `value`.
+    En el .ini los números y booleanos vuelven como texto ("5", "true") y las
+    listas como listas de texto. Ante la duda devuelve False (se reescribe).
+    """
+    if stored is None:
+        return False
+    if isinstance(value, bool):
+        return str(stored).lower() == ("true" if value else "false")
+    if isinstance(value, (int, str)):
+        return str(stored) == str(value)
+    if isinstance(value, (list, tuple)):
+        return (
+            isinstance(stored, list)
+            and len(stored) == len(value)
+            and all(_setting_unchanged(a, b) for a, b in zip(stored, value))
+        )
+    if isinstance(value, QByteArray):
+        return isinstance(stored, QByteArray) and stored == value
+    return False
+
+
+def write_settings_groups(settings: QSettings, groups: Dict[str, Dict[str, object]]):
+    """
+    Escribe {grupo: {clave: valor}} y vuelca el archivo una sola vez.
+    Las claves que ya tienen ese valor no se tocan: si nada cambió desde
+    el inicio, el .ini no se reescribe.
+    """
+    changed = False
+    for group, values in groups.items():
+        if not values:
+            continue
+        settings.beginGroup(group)
+        try:
+            for key, value in values.items():
+                if _setting_unchanged(settings.value(key), value):
+                    continue
+                settings.setValue(key, value)
+                changed = True
+        finally:
+            settings.endGroup()
+    if changed:
+        settings.sync()
+
+
+class SettingsWriter(QRunnable):
+    """
+    Guarda el estado al cerrar fuera del hilo de la UI. Usa su propio QSettings
+    sobre el mismo .ini (un QSettings no se comparte entre hilos); los valores
+    ya vienen calculados desde la UI (saveGeometry, tamaños...).
+    Es seguro junto al QSettings de MainWindow: ese solo se lee (nunca tiene
+    cambios pendientes que pudiera volcar después) y QSettings bloquea el
+    archivo al escribir.
+    """
+
+    def __init__(self, file_name: str, groups: Dict[str, Dict[str, object]]):
+        super().__init__()
+        self.file_name = file_name
+        self.groups = groups
+
+    def run(self):
+        try:
+            write_settings_groups(QSettings(self.file_name, QSettings.Format.IniFormat), self.groups)
+        except Exception:
+            pass
+
+
 class MainWindow(QMainWindow):
     APP_NAME = "Dual Audio Tag Manager"
+    # Miniaturas de carátulas que se conservan en disco entre sesiones
+    COVER_THUMBS_MAX = 2000
 
     def __init__(self):
         super().__init__()
 
-        # QSettings en IniFormat y UserScope (CRÍTICO)
-        QSettings.setDefaultFormat(QSettings.Format.IniFormat)
-        QSettings.setPath(QSettings.Format.IniFormat, QSettings.Scope.UserScope, "")
+        # QSettings en IniFormat y UserScope (CRÍTICO). El constructor ya fija formato
+        # y ámbito: sin setDefaultFormat/setPath globales (setPath con "" dejaba el
+        # .ini relativo a la raíz del sistema de archivos).
         self.settings = QSettings(QSettings.Format.IniFormat, QSettings.Scope.UserScope,
                                   "DualAudioTagManager", "DualAudioTagManager")
 
+        # Cachés persistentes de tags y de miniaturas de carátulas. Se pueden
+        # regenerar: van a la carpeta de caché del usuario, no junto al .ini
+        self.tags_disk_cache: Optional[TagsDiskCache] = None
+        cache_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                self.tags_disk_cache = TagsDiskCache(os.path.join(cache_dir, "tagcache.sqlite"))
+            except Exception:
+                pass
+            try:
+                thumbs_dir = os.path.join(cache_dir, "covers")
+                os.makedirs(thumbs_dir, exist_ok=True)
+                COVER_THUMBS.attach_dir(thumbs_dir)
+            except Exception:
+                pass
+        TAGS_CACHE.attach_disk(self.tags_disk_cache)
+        # Confirmar las tandas pendientes aunque el escaneo se haya detenido
+        self._tags_commit_timer = QTimer(self)
+        self._tags_commit_timer.setInterval(int(TagsDiskCache.COMMIT_INTERVAL * 1000))
+        if self.tags_disk_cache is not None:
+            self._tags_commit_timer.timeout.connect(self.tags_disk_cache.commit)
+            self._tags_commit_timer.start()
+
         self.setWindowTitle(self.APP_NAME)
         self.setMinimumSize(1100, 650)
 
         # Layout principal: splitter horizontal (panel izq / panel der)
         self.splitter = QSplitter(Qt.Orientation.Horizontal, self)
 
-        default_music = str(Path.home() / "Music")
-        if not os.path.isdir(default_music):
-            default_music = str(Path.home())
+        # Carpeta de música del sistema (localizada: "Música", XDG_MUSIC_DIR...).
+        # Qt la devuelve aunque no exista, así que se comprueba una vez.
+        default_music = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.MusicLocation)
+        if not default_music or not os.path.isdir(default_music):
+            default_music = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.HomeLocation)
 
         self.left_panel = AudioPanel(self.settings, "left", self)
         self.right_panel = AudioPanel(self.settings, "right", self)
@@ -1151,13 +2729,25 @@ class MainWindow(QMainWindow):
 
         # Tema (default: oscuro ON para garantizar legibilidad y cumplir requisitos)
         self.dark_mode_enabled = True
+        self._last_saved_ui: Optional[Tuple[bool, str]] = None  # (tema, tamaño) guardados en el ini
+        self._about_dialog: Optional[QMessageBox] = None  # se crea al abrir "Acerca de"
 
         # Restaurar estado (incluye maximizado y geometría)
         self._restore_window_state(default_music)
 
         # Conectar cambios para refrescar botones
-        self.left_panel.selectionChanged.connect(self._update_action_buttons)
-        self.right_panel.selectionChanged.connect(self._update_action_buttons)
+        self._copy_enabled: Optional[bool] = None  # último estado aplicado a los botones
+        # Copias en segundo plano (CopyWorker)
+        self._copy_busy = False
+        self._copy_signals = CopyWorkerSignals(self)
+        self._copy_signals.done.connect(self._on_copy_done)
+        # Agrupar ráfagas de cambios de selección (flechas) en una sola actualización
+        self._action_update_timer = QTimer(self)
+        self._action_update_timer.setSingleShot(True)
+        self._action_update_timer.setInterval(30)
+        self._action_update_timer.timeout.connect(self._update_action_buttons)
+        self.left_panel.selectionChanged.connect(self._action_update_timer.start)
+        self.right_panel.selectionChanged.connect(self._action_update_timer.start)
         self._update_action_buttons()
 
     # -------- Menú --------
@@ -1196,27 +2786,36 @@ class MainWindow(QMainWindow):
             act.setChecked(act is sender)
 
         if sender is self.act_size_small:
-            self.current_cover_size_key = "pequeña"
+            new_key = "pequeña"
         elif sender is self.act_size_big:
-            self.current_cover_size_key = "grande"
+            new_key = "grande"
         else:
-            self.current_cover_size_key = "mediana"
+            new_key = "mediana"
+        # Mismo tamaño: no reescalar/releer las carátulas de los panels
+        if new_key == self.current_cover_size_key:
+            return
+        self.current_cover_size_key = new_key
 
         self._apply_cover_size_to_panels()
-        self._save_ui_prefs()
 
     def _apply_cover_size_to_panels(self):
         px = self.cover_sizes.get(self.current_cover_size_key, 220)
-        self.left_panel.set_cover_size(px)
-        self.right_panel.set_cover_size(px)
+        # Los dos panels se repintan juntos, en una sola pasada
+        self.setUpdatesEnabled(False)
+        try:
+            self.left_panel.set_cover_size(px)
+            self.right_panel.set_cover_size(px)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def _toggle_dark_mode(self, checked: bool):
+        if bool(checked) == self.dark_mode_enabled:
+            return  # ya aplicado: no volver a procesar el QSS
         self.dark_mode_enabled = bool(checked)
         if self.dark_mode_enabled:
             apply_dark_theme(QApplication.instance())
         else:
             apply_light_theme(QApplication.instance())
-        self._save_ui_prefs()
 
     # -------- Copiar carátula / tags --------
     def _selected_pair(self) -> Tuple[str, str]:
@@ -1226,44 +2825,56 @@ class MainWindow(QMainWindow):
 
     def _update_action_buttons(self):
         left, right = self._selected_pair()
-        ok = bool(left and right and os.path.exists(left) and os.path.exists(right))
+        # Las rutas vienen del modelo (archivos listados): sin stat en cada selección
+        ok = bool(left and right) and not self._copy_busy
+        if ok == self._copy_enabled:
+            return
+        self._copy_enabled = ok
         self.btn_copy_cover.setEnabled(ok)
         self.btn_copy_tags.setEnabled(ok)
 
     def copy_cover_left_to_right(self):
-        left, right = self._selected_pair()
-        if not left or not right:
-            return
-
-        try:
-            cover = get_cover_bytes(left)
-            if not cover:
-                QMessageBox.information(self, "Carátula", "El archivo del panel izquierdo no tiene carátula embebida.")
-                return
-            data, mime = cover
-            set_cover_bytes(right, data, mime)
-            # refrescar panel derecho
-            self.right_panel._refresh_info(right)
-            QMessageBox.information(self, "Carátula", "Carátula copiada correctamente (Izq → Der).")
-        except Exception as e:
-            self._show_error("Error al copiar carátula", e)
+        self._start_copy(copy_cover)
 
     def copy_tags_left_to_right(self):
+        self._start_copy(copy_tags)
+
+    def _start_copy(self, func):
         left, right = self._selected_pair()
-        if not left or not right:
+        if not left or not right or self._copy_busy:
             return
+        # Una copia a la vez: los botones quedan deshabilitados hasta que termine
+        self._copy_busy = True
+        self._update_action_buttons()
+        QThreadPool.globalInstance().start(CopyWorker(self._copy_signals, func, left, right))
 
-        try:
-            tags = get_tags(left)
-            set_tags(right, tags)
-            # refrescar panel derecho
-            self.right_panel._refresh_info(right)
+    def _on_copy_done(self, func, src: str, dst: str, result, exc: Optional[Exception]):
+        self._copy_busy = False
+        self._update_action_buttons()
+        is_cover = func is copy_cover
+        if exc is not None:
+            self._show_error("Error al copiar carátula" if is_cover else "Error al copiar tags", exc)
+            return
+        if is_cover and not result:
+            QMessageBox.information(self, "Carátula", "El archivo del panel izquierdo no tiene carátula embebida.")
+            return
+        # refrescar panel derecho (si mientras tanto se seleccionó otro archivo, solo el modelo)
+        self.right_panel.model.refresh_path(dst)
+        if self.right_panel.selected_file_path() == dst:
+            self.right_panel._refresh_info(dst)
+        if is_cover:
+            QMessageBox.information(self, "Carátula", "Carátula copiada correctamente (Izq → Der).")
+        else:
             QMessageBox.information(self, "Metadatos", "Tags copiados correctamente (Izq → Der).")
-        except Exception as e:
-            self._show_error("Error al copiar tags", e)
 
     # -------- About --------
     def show_about(self):
+        # El contenido es fijo: se construye la primera vez y se reutiliza
+        if self._about_dialog is None:
+            self._about_dialog = self._build_about()
+        self._about_dialog.exec()
+
+    def _build_about(self) -> QMessageBox:
         # Enlaces usando QPalette::Link y LinkVisited (NO Highlight, NO colores fijos).
         # QLabel tomará palette(Link) si está en rich text.
         about = QMessageBox(self)
@@ -1288,22 +2899,27 @@ class MainWindow(QMainWindow):
         about.setDefaultButton(QMessageBox.StandardButton.Ok)
 
         # Forzar que los links usen palette Link/LinkVisited (ya está en el tema oscuro).
-        about.exec()
+        return about
 
     # -------- Persistencia / Restauración --------
-    def _save_ui_prefs(self):
-        self.settings.setValue("ui/dark_mode", self.dark_mode_enabled)
-        self.settings.setValue("ui/cover_size", self.current_cover_size_key)
+    def _ui_prefs_values(self) -> Dict[str, object]:
+        # Se guardan solo al cerrar (closeEvent), y solo si cambiaron desde el inicio
+        cur = (self.dark_mode_enabled, self.current_cover_size_key)
+        if cur == self._last_saved_ui:
+            return {}
+        return {
+            "dark_mode": self.dark_mode_enabled,
+            "cover_size": self.current_cover_size_key,
+        }
 
     def _restore_ui_prefs(self):
         dark = self.settings.value("ui/dark_mode", False, type=bool)
         self.dark_mode_enabled = dark
         self.act_dark.setChecked(self.dark_mode_enabled)
 
+        # Al iniciar la app ya tiene el tema del sistema: solo aplicar el oscuro
         if self.dark_mode_enabled:
             apply_dark_theme(QApplication.instance())
-        else:
-            apply_light_theme(QApplication.instance())
 
         size_key = self.settings.value("ui/cover_size", "mediana", type=str)
         if size_key in self.cover_sizes:
@@ -1313,6 +2929,7 @@ class MainWindow(QMainWindow):
         self.act_size_med.setChecked(self.current_cover_size_key == "mediana")
         self.act_size_big.setChecked(self.current_cover_size_key == "grande")
         self._apply_cover_size_to_panels()
+        self._last_saved_ui = (self.dark_mode_enabled, self.current_cover_size_key)
 
     def _restore_window_state(self, default_music: str):
         # UI prefs (tema y tamaño carátula)
@@ -1333,7 +2950,7 @@ class MainWindow(QMainWindow):
         # Geometría ventana / maximizado
         geom = self.settings.value("main/geometry", None)
         state = self.settings.value("main/windowState", None)
-        was_max = self.settings.value("main/maximized", True)
+        was_max = self.settings.value("main/maximized", True, type=bool)
 
         if geom is not None:
             try:
@@ -1347,54 +2964,80 @@ class MainWindow(QMainWindow):
                 pass
 
         # Por requisito: abrir maximizado por defecto
-        if str(was_max).lower() in ("true", "1", "yes"):
-            QTimer.singleShot(0, self.showMaximized)
-        else:
-            QTimer.singleShot(0, self.show)
+        show = "showMaximized" if was_max else "show"
+        QMetaObject.invokeMethod(self, show, Qt.ConnectionType.QueuedConnection)
 
     def closeEvent(self, event):
+        pool = QThreadPool.globalInstance()
+        # Escaneos/precargas en cola ya no sirven; que no retrasen el guardado
+        # (main() espera al pool global, y el cierre a los de cada panel)
+        for panel in (self.left_panel, self.right_panel):
+            panel.cancel_background_work()
         try:
-            # Guardar panels
-            self.left_panel.save_state()
-            self.right_panel.save_state()
-
-            # Splitter principal
-            self.settings.setValue("main/splitter_sizes", self.splitter.sizes())
-
-            # Ventana
-            self.settings.setValue("main/geometry", self.saveGeometry())
-            self.settings.setValue("main/windowState", self.saveState())
-            self.settings.setValue("main/maximized", self.isMaximized())
-
-            # UI prefs
-            self._save_ui_prefs()
-
-            self.settings.sync()
+            # Todo el estado (panels, ventana, preferencias) se lee aquí (toca
+            # widgets) y se escribe de una vez en un hilo del pool; main()
+            # espera a que termine antes de salir
+            pool.start(SettingsWriter(self.settings.fileName(), {
+                self.left_panel.key_prefix: self.left_panel.state_values(),
+                self.right_panel.key_prefix: self.right_panel.state_values(),
+                "main": {
+                    "splitter_sizes": self.splitter.sizes(),
+                    "geometry": self.saveGeometry(),
+                    "windowState": self.saveState(),
+                    "maximized": self.isMaximized(),
+                },
+                "ui": self._ui_prefs_values(),
+            }))
         except Exception:
             pass
+        pool.start(functools.partial(COVER_THUMBS.prune, self.COVER_THUMBS_MAX))
+        self._tags_commit_timer.stop()
+        if self.tags_disk_cache is not None:
+            TAGS_CACHE.attach_disk(None)
+            try:
+                self.tags_disk_cache.close()
+            except Exception:
+                pass
         super().closeEvent(event)
 
     # -------- Utilidades --------
     def _show_error(self, title: str, exc: Exception):
-        details = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
         msg = QMessageBox(self)
         msg.setIcon(QMessageBox.Icon.Critical)
         msg.setWindowTitle(title)
         msg.setText(str(exc))
-        msg.setDetailedText(details)
+        # El traceback solo se formatea si el usuario abre los detalles
+        # (el texto provisional hace que QMessageBox cree el botón de detalles)
+        msg.setDetailedText("…")
+        filled = False
+
+        def fill_details():
+            nonlocal filled
+            if not filled:
+                filled = True
+                msg.setDetailedText("".join(traceback.format_exception(type(exc), exc, exc.__traceback__)))
+
+        for btn in msg.buttons():
+            if msg.buttonRole(btn) == QMessageBox.ButtonRole.ActionRole:
+                btn.clicked.connect(fill_details)
         msg.exec()
 
 
 # ---------- main ----------
 def main():
     app = QApplication(sys.argv)
+    # Nombre de la carpeta de caché (QStandardPaths.CacheLocation)
+    app.setApplicationName("DualAudioTagManager")
 
     # Icono opcional (si lo quieres luego, puedes añadir un .ico/.png y cargarlo aquí)
     # app.setWindowIcon(QIcon("icon.png"))
 
     w = MainWindow()
     # w.showMaximized()  # ya lo maneja la restauración con default maximizado
-    sys.exit(app.exec())
+    ret = app.exec()
+    # Terminar las escrituras pendientes (estado al cerrar, copias en curso)
+    QThreadPool.globalInstance().waitForDone()
+    sys.exit(ret)
 
 
 if __name__ == "__main__":